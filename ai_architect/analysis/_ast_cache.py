@@ -0,0 +1,78 @@
+"""
+On-disk cache of per-file AST analysis results.
+Entries are keyed by the file's absolute path, the module name it was analyzed
+under (relative imports are resolved against it) and the cache format, and are
+invalidated whenever the file's mtime or size changes, so unchanged files skip
+open/read/ast.parse entirely. Entries are plain JSON, never pickles.
+"""
+
+import os
+import sys
+import json
+import hashlib
+import logging
+import threading
+from pathlib import Path
+from typing import Any, Optional, Tuple
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+logger = logging.getLogger("ArchAI.Analysis")
+
+# Bump whenever the payload layout changes so entries written by older versions are ignored
+CACHE_FORMAT = 3
+
+def _user_cache_dir() -> Path:
+    """Per-user ArchAI cache root, so caches never depend on the working directory."""
+    if os.name == "nt":
+        base = os.environ.get("LOCALAPPDATA") or Path.home() / "AppData" / "Local"
+    elif sys.platform == "darwin":
+        base = Path.home() / "Library" / "Caches"
+    else:
+        base = os.environ.get("XDG_CACHE_HOME") or Path.home() / ".cache"
+    return Path(base) / "archai"
+
+CACHE_DIR = _user_cache_dir() / "ast"
+
+def _signature(path: Path) -> Tuple[int, int]:
+    st = path.stat()
+    return st.st_mtime_ns, st.st_size
+
+def _entry_path(path: Path, module_name: str) -> Path:
+    key = f"{CACHE_FORMAT}\0{Path(path).resolve()}\0{module_name}"
+    digest = hashlib.sha1(key.encode("utf-8")).hexdigest()
+    return CACHE_DIR / f"{digest}.json"
+
+def _dumps(value: Any) -> bytes:
+    if orjson is not None:
+        return orjson.dumps(value)
+    return json.dumps(value).encode("utf-8")
+
+def _loads(raw: bytes) -> Any:
+    return orjson.loads(raw) if orjson is not None else json.loads(raw)
+
+def get(path: Path, module_name: str) -> Optional[Any]:
+    """Returns the cached payload for path analyzed as module_name, or None if missing or stale."""
+    try:
+        entry = _loads(_entry_path(path, module_name).read_bytes())
+        if tuple(entry["signature"]) == _signature(path):
+            return entry["payload"]
+    except FileNotFoundError:
+        pass
+    except Exception as e:
+        logger.debug(f"AST cache read failed for {path}: {e}")
+    return None
+
+def put(path: Path, module_name: str, payload: Any):
+    """Stores a JSON-serializable payload for path, tagged with the file's current mtime/size."""
+    try:
+        entry = _entry_path(path, module_name)
+        entry.parent.mkdir(parents=True, exist_ok=True)
+        tmp = entry.with_suffix(f".{os.getpid()}.{threading.get_ident()}.tmp")
+        tmp.write_bytes(_dumps({"signature": _signature(path), "payload": payload}))
+        os.replace(tmp, entry)
+    except Exception as e:
+        logger.debug(f"AST cache write failed for {path}: {e}")
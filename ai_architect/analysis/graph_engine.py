@@ -1,14 +1,24 @@
 import ast
 import os
+import mmap
+import re
 import json
 import subprocess
+from collections import defaultdict, deque
+import threading
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from concurrent.futures.process import BrokenProcessPool
 from pathlib import Path
 from typing import Dict, List, Set, Any, Optional, Tuple
 import logging
+from . import _ast_cache
 
 logger = logging.getLogger("ArchAI.Analysis")
 
 class FunctionNode:
+    __slots__ = ('name', 'lineno', 'calls', 'docstring')
+
     def __init__(self, name: str, lineno: int):
         self.name = name
         self.lineno = lineno
@@ -16,9 +26,12 @@ class FunctionNode:
         self.docstring: Optional[str] = None
 
 class ModuleNode:
+    __slots__ = ('file_path', 'module_name', '_norm_path', 'classes', 'functions', 'imports', 'docstring', 'ownership', 'metrics')
+
     def __init__(self, file_path: Path, module_name: str):
         self.file_path = file_path
         self.module_name = module_name
+        self._norm_path = os.path.normcase(os.path.normpath(str(file_path)))
         self.classes: Dict[str, List[str]] = {} # class_name -> [method_names]
         self.functions: Dict[str, FunctionNode] = {} # func_name -> FunctionNode (includes class.method)
         self.imports: List[str] = [] # Absolute module names after resolution
@@ -32,6 +45,210 @@ class ModuleNode:
             "fan_out": 0
         }
 
+# Trie marker holding the full module name of a terminal segment.
+_TRIE_END = "__end__"
+
+# First top-level definition; everything above it is the import header.
+_IMPORT_BOUNDARY_RE = re.compile(r'^(?:class|def|async\s+def)\s', re.M)
+_TOP_LEVEL_CLASS_RE = re.compile(r'^class\s+(\w+)', re.M)
+
+# Path keywords -> (priority, layer); lookahead so overlapping keywords are all found.
+_OWNERSHIP_RE = re.compile(r'(?=(infrastructure|persistence|caching|core|orchestrator|api|interface|model|data|test))', re.I)
+_OWNERSHIP_MAP = {
+    'infrastructure': (0, 'Infrastructure'), 'persistence': (0, 'Infrastructure'), 'caching': (0, 'Infrastructure'),
+    'core': (1, 'Core'), 'orchestrator': (1, 'Core'),
+    'api': (2, 'Interface'), 'interface': (2, 'Interface'),
+    'model': (3, 'Data'), 'data': (3, 'Data'),
+    'test': (4, 'Test'),
+}
+
+# Below this many cache misses, handing files to worker processes costs more than it saves.
+PARALLEL_ANALYSIS_THRESHOLD = 16
+
+def _extract_imports(item, module_name: str, imports: List[str]):
+    if isinstance(item, ast.Import):
+        for alias in item.names:
+            imports.append(alias.name)
+    elif isinstance(item, ast.ImportFrom):
+        base_module = item.module or ""
+        if item.level > 0:
+            parts = module_name.split('.')
+            prefix_parts = parts[:-item.level]
+            if base_module:
+                prefix_parts.append(base_module)
+            resolved = '.'.join(prefix_parts)
+            imports.append(resolved)
+        else:
+            imports.append(base_module)
+
+# Leaf nodes that can never contain a call; never pushed onto the traversal stack.
+# (ast.arg is not a leaf: its annotation may hold calls such as Depends(get_db).)
+_CALL_FREE_NODES = frozenset({
+    ast.Name, ast.Constant, ast.alias,
+    ast.Load, ast.Store, ast.Del, ast.Pass, ast.Break, ast.Continue,
+})
+
+def _extract_calls_from_scope(scope: ast.AST, func_node: FunctionNode):
+    """Finds all calls within a function scope using an explicit stack (no ast.walk)."""
+    calls = func_node.calls
+    stack = [scope]
+    while stack:
+        n = stack.pop()
+        if type(n) is ast.Call:
+            func = n.func
+            func_type = type(func)
+            if func_type is ast.Name:
+                calls.append(func.id)
+            elif func_type is ast.Attribute and type(func.value) is ast.Name:
+                calls.append(f"{func.value.id}.{func.attr}")
+        for child in ast.iter_child_nodes(n):
+            if type(child) not in _CALL_FREE_NODES:
+                stack.append(child)
+
+class _ModuleVisitor(ast.NodeVisitor):
+    """
+    Collects docstring, top-level classes/methods/functions, and module-level imports in one
+    traversal. Function bodies are handed to _extract_calls_from_scope rather than visited,
+    so nested definitions and function-local imports are not registered.
+    """
+
+    def __init__(self, module_name: str):
+        self.module_name = module_name
+        self.classes: Dict[str, List[str]] = {}
+        self.functions: Dict[str, FunctionNode] = {}
+        self.imports: List[str] = []
+        self.docstring: Optional[str] = None
+        self._class_stack: List[str] = []
+
+    def visit_Module(self, node: ast.Module):
+        self.docstring = ast.get_docstring(node)
+        for item in node.body:
+            if isinstance(item, (ast.ClassDef, ast.FunctionDef, ast.Import, ast.ImportFrom)):
+                self.visit(item)
+
+    def visit_ClassDef(self, node: ast.ClassDef):
+        methods = []
+        self._class_stack.append(node.name)
+        for sub in node.body:
+            if isinstance(sub, ast.FunctionDef):
+                methods.append(sub.name)
+                self.visit(sub)
+        self._class_stack.pop()
+        self.classes[node.name] = methods
+
+    def visit_FunctionDef(self, node: ast.FunctionDef):
+        func_node = FunctionNode(node.name, node.lineno)
+        func_node.docstring = ast.get_docstring(node)
+        qualified = f"{self._class_stack[-1]}.{node.name}" if self._class_stack else node.name
+        self.functions[qualified] = func_node
+        _extract_calls_from_scope(node, func_node)
+
+    def visit_Import(self, node: ast.Import):
+        _extract_imports(node, self.module_name, self.imports)
+
+    def visit_ImportFrom(self, node: ast.ImportFrom):
+        _extract_imports(node, self.module_name, self.imports)
+
+def _scan_imports(file_path: Path, module_name: str) -> Optional[Tuple]:
+    """
+    Cheap path for callers that only need the dependency graph: parses just the header
+    above the first top-level class/def and picks class names up by regex (methods and calls
+    are left empty). Imports placed after the first definition are not seen.
+    Returns None when the header does not parse on its own.
+    """
+    with open(file_path, 'r', encoding='utf-8', errors='ignore') as f:
+        content = f.read()
+    boundary = _IMPORT_BOUNDARY_RE.search(content)
+    header = content[:boundary.start()] if boundary else content
+    try:
+        tree = ast.parse(header, filename=str(file_path))
+    except SyntaxError:
+        return None
+    visitor = _ModuleVisitor(module_name)
+    visitor.visit(tree)
+    classes = {name: [] for name in _TOP_LEVEL_CLASS_RE.findall(content)}
+    return module_name, classes, {}, visitor.imports, visitor.docstring
+
+def _parse_file(file_path: Path) -> ast.Module:
+    """
+    Parses a source file straight from a read-only memory map, so the source never becomes
+    a Python str. Files that are not valid UTF-8 fall back to the lenient text read.
+    """
+    with open(file_path, 'rb') as f:
+        size = os.fstat(f.fileno()).st_size
+        if size == 0:
+            return ast.Module(body=[], type_ignores=[])
+        try:
+            with mmap.mmap(f.fileno(), size, access=mmap.ACCESS_READ) as mm:
+                return ast.parse(mm, filename=str(file_path))
+        except (SyntaxError, UnicodeDecodeError, ValueError):
+            pass
+    with open(file_path, 'r', encoding='utf-8', errors='ignore') as f:
+        return ast.parse(f.read(), filename=str(file_path))
+
+def _to_cache_payload(classes: Dict[str, List[str]], functions: Dict[str, FunctionNode], imports: List[str], docstring: Optional[str]) -> List[Any]:
+    """JSON-only form of an analysis result for the on-disk AST cache."""
+    return [classes, {name: [f.lineno, f.calls, f.docstring] for name, f in functions.items()}, imports, docstring]
+
+def _from_cache_payload(payload: List[Any]) -> Tuple[Dict[str, List[str]], Dict[str, FunctionNode], List[str], Optional[str]]:
+    classes, raw_functions, imports, docstring = payload
+    functions = {}
+    for name, (lineno, calls, func_doc) in raw_functions.items():
+        func_node = FunctionNode(name.rsplit('.', 1)[-1], lineno)
+        func_node.calls = calls
+        func_node.docstring = func_doc
+        functions[name] = func_node
+    return classes, functions, imports, docstring
+
+def _analyze_file_worker(file_path: Path, module_name: str, full: bool = True) -> Tuple[str, Dict[str, List[str]], Dict[str, FunctionNode], List[str], Optional[str], bool]:
+    """
+    Parses a single file and returns picklable results so it can run in a worker process.
+    Returns (module_name, classes, functions, imports, docstring, complete), where complete
+    marks a successful full parse the caller may store in the AST cache; workers never touch it.
+    With full=False only the import header is parsed (see _scan_imports).
+    """
+    if not full:
+        try:
+            scanned = _scan_imports(file_path, module_name)
+            if scanned is not None:
+                return (*scanned, False)
+        except Exception as e:
+            logger.warning(f"Import scan failed for {file_path}: {e}")
+            return module_name, {}, {}, [], None, False
+
+    try:
+        tree = _parse_file(file_path)
+
+        visitor = _ModuleVisitor(module_name)
+        visitor.visit(tree)
+    except Exception as e:
+        logger.warning(f"AST Analysis failed for {file_path}: {e}")
+        return module_name, {}, {}, [], None, False
+    return module_name, visitor.classes, visitor.functions, visitor.imports, visitor.docstring, True
+
+# One bounded worker pool per process, shared by every GraphEngine (API threads, VALIDATE-LOCAL,
+# Discovery). Workers come from forkserver (spawn where unavailable) rather than fork, so
+# they never inherit a copy of a parent that is running other threads.
+ANALYSIS_WORKERS = min(8, os.cpu_count() or 1)
+_analysis_pool: Optional[ProcessPoolExecutor] = None
+_analysis_pool_lock = threading.Lock()
+
+def _get_analysis_pool() -> ProcessPoolExecutor:
+    global _analysis_pool
+    with _analysis_pool_lock:
+        if _analysis_pool is None:
+            method = "forkserver" if "forkserver" in multiprocessing.get_all_start_methods() else "spawn"
+            _analysis_pool = ProcessPoolExecutor(max_workers=ANALYSIS_WORKERS, mp_context=multiprocessing.get_context(method))
+        return _analysis_pool
+
+def _discard_analysis_pool(pool: ProcessPoolExecutor):
+    """Drops a broken pool so the next parallel analysis starts a fresh one."""
+    global _analysis_pool
+    with _analysis_pool_lock:
+        if _analysis_pool is pool:
+            _analysis_pool = None
+    pool.shutdown(wait=False, cancel_futures=True)
+
 class GraphEngine:
     """
     Deterministic Architecture Graph Engine with Function-Level Call Tracing.
@@ -41,6 +258,15 @@ class GraphEngine:
     def __init__(self, root_path: Path):
         self.root_path = root_path
         self.nodes: Dict[str, ModuleNode] = {} # module_name -> ModuleNode
+        self._module_trie: Dict[str, Any] = {} # dotted-segment trie of module names
+        self._internal_imports: Dict[str, List[str]] = {} # module_name -> resolved internal imports
+        self._importers: Dict[str, Set[str]] = {} # module_name -> modules importing it
+        self._depth_cache: Dict[str, int] = {}
+        self._in_stack: Set[str] = set()
+        self._churn_map: Optional[Dict[str, int]] = None # relative posix path -> commit count
+        self._callee_index: Dict[str, List[Tuple[str, str]]] = {} # call string -> [(module, function)]
+        self._callee_suffix_index: Dict[str, List[Tuple[str, str]]] = {} # dotted suffix of a call -> [(module, function)]
+        self._summary_cache: Optional[Dict[str, Any]] = None
         self.ignore_dirs = {'.git', '__pycache__', '.venv', 'venv', 'env', 'node_modules', 'dist', 'build'}
 
     def resolve_module_name(self, file_path: Path) -> str:
@@ -52,80 +278,94 @@ class GraphEngine:
         except Exception:
             return file_path.stem
 
-    def analyze_project(self):
-        """Walks the project and analyzes all Python files."""
+    def analyze_project(self, full: bool = True):
+        """
+        Walks the project and analyzes all Python files.
+        full=False only parses import headers: metrics, ownership, and relationships are
+        still computed, but functions and call graphs are left empty. That mode never reads
+        the AST cache, so its results do not depend on what earlier full runs cached.
+        """
+        self._summary_cache = None
+        
         # 1. First pass: Identify all internal modules
-        for path in self.root_path.rglob('*.py'):
-            if any(part in self.ignore_dirs for part in path.parts):
-                continue
-            module_name = self.resolve_module_name(path)
-            self.nodes[module_name] = ModuleNode(path, module_name)
+        for dirpath, dirnames, filenames in os.walk(self.root_path):
+            # Prune in place so ignored trees (.venv, node_modules, ...) are never entered
+            dirnames[:] = [d for d in dirnames if d not in self.ignore_dirs]
+            for filename in filenames:
+                if not filename.endswith('.py'):
+                    continue
+                path = Path(dirpath) / filename
+                module_name = self.resolve_module_name(path)
+                self.nodes[module_name] = ModuleNode(path, module_name)
+        self._build_module_trie()
 
-        # 2. Second pass: Detailed AST analysis per file
-        for name, node in self.nodes.items():
-            self._analyze_file(node)
+        # 2. Second pass: Detailed AST analysis per file; only cache misses are parsed
+        misses = [node for node in self.nodes.values() if not (full and self._load_cached(node))]
+        if len(misses) > PARALLEL_ANALYSIS_THRESHOLD:
+            self._analyze_files_parallel(misses, full)
+        else:
+            for node in misses:
+                self._analyze_file(node, full)
         
         # 3. Third pass: Resolve ownership and additional metadata
         self._resolve_dependencies()
         
         # 4. Fourth pass: Calculate metrics
+        self._load_git_churn()
         self._calculate_metrics()
+        self._build_call_index()
+
+    def _build_module_trie(self):
+        self._module_trie = {}
+        for module_name in self.nodes:
+            level = self._module_trie
+            for segment in module_name.split('.'):
+                level = level.setdefault(segment, {})
+            level[_TRIE_END] = module_name
+
+    def _resolve_internal(self, imp: str) -> Optional[str]:
+        """Longest-prefix match of an import against internal module names."""
+        level = self._module_trie
+        match = None
+        for segment in imp.split('.'):
+            level = level.get(segment)
+            if level is None:
+                break
+            match = level.get(_TRIE_END, match)
+        return match
 
-    def _analyze_file(self, node: ModuleNode):
+    def _load_cached(self, node: ModuleNode) -> bool:
+        """Fills node from the on-disk AST cache; False when the file has to be parsed."""
+        cached = _ast_cache.get(node.file_path, node.module_name)
+        if cached is None:
+            return False
+        node.classes, node.functions, node.imports, node.docstring = _from_cache_payload(cached)
+        return True
+
+    def _analyze_file(self, node: ModuleNode, full: bool = True):
+        self._apply_analysis(node, _analyze_file_worker(node.file_path, node.module_name, full))
+
+    def _analyze_files_parallel(self, nodes: List[ModuleNode], full: bool = True):
+        """Distributes per-file AST analysis of nodes across the shared worker pool."""
+        pending = {node.module_name: node for node in nodes}
+        pool = None
         try:
-            with open(node.file_path, 'r', encoding='utf-8', errors='ignore') as f:
-                content = f.read()
-                tree = ast.parse(content, filename=str(node.file_path))
-                
-            node.docstring = ast.get_docstring(tree)
-            
-            for item in tree.body:
-                if isinstance(item, ast.ClassDef):
-                    methods = []
-                    for sub in item.body:
-                        if isinstance(sub, ast.FunctionDef):
-                            methods.append(sub.name)
-                            func_node = FunctionNode(sub.name, sub.lineno)
-                            func_node.docstring = ast.get_docstring(sub)
-                            self._extract_calls_from_scope(sub, func_node)
-                            node.functions[f"{item.name}.{sub.name}"] = func_node
-                    node.classes[item.name] = methods
-                elif isinstance(item, ast.FunctionDef):
-                    func_node = FunctionNode(item.name, item.lineno)
-                    func_node.docstring = ast.get_docstring(item)
-                    self._extract_calls_from_scope(item, func_node)
-                    node.functions[item.name] = func_node
-                elif isinstance(item, (ast.Import, ast.ImportFrom)):
-                    self._extract_imports(item, node)
-                    
+            pool = _get_analysis_pool()
+            futures = [pool.submit(_analyze_file_worker, node.file_path, node.module_name, full) for node in nodes]
+            for future in as_completed(futures):
+                result = future.result()
+                self._apply_analysis(pending.pop(result[0]), result)
         except Exception as e:
-            logger.warning(f"AST Analysis failed for {node.file_path}: {e}")
-
-    def _extract_calls_from_scope(self, scope: ast.AST, func_node: FunctionNode):
-        """Recursively finds all calls within a function scope."""
-        for sub_node in ast.walk(scope):
-            if isinstance(sub_node, ast.Call):
-                if isinstance(sub_node.func, ast.Name):
-                    func_node.calls.append(sub_node.func.id)
-                elif isinstance(sub_node.func, ast.Attribute):
-                    if isinstance(sub_node.func.value, ast.Name):
-                        func_node.calls.append(f"{sub_node.func.value.id}.{sub_node.func.attr}")
-
-    def _extract_imports(self, item, node: ModuleNode):
-        if isinstance(item, ast.Import):
-            for alias in item.names:
-                node.imports.append(alias.name)
-        elif isinstance(item, ast.ImportFrom):
-            base_module = item.module or ""
-            if item.level > 0:
-                parts = node.module_name.split('.')
-                prefix_parts = parts[:-item.level]
-                if base_module:
-                    prefix_parts.append(base_module)
-                resolved = '.'.join(prefix_parts)
-                node.imports.append(resolved)
-            else:
-                node.imports.append(base_module)
+            if isinstance(e, BrokenProcessPool) and pool is not None:
+                _discard_analysis_pool(pool)
+            logger.warning(f"Parallel AST analysis unavailable ({e}). Falling back to sequential scan.")
+            for node in pending.values():
+                self._analyze_file(node, full)
+
+    def _apply_analysis(self, node: ModuleNode, result: Tuple):
+        _, node.classes, node.functions, node.imports, node.docstring, complete = result
+        if complete:
+            _ast_cache.put(node.file_path, node.module_name, _to_cache_payload(node.classes, node.functions, node.imports, node.docstring))
 
     def _resolve_dependencies(self):
         """Infers ownership and cross-file relationships."""
@@ -133,36 +373,64 @@ class GraphEngine:
             node.ownership = self._infer_ownership(node)
 
     def _infer_ownership(self, node: ModuleNode) -> str:
-        path_str = str(node.file_path).replace("\\", "/").lower()
-        if "infrastructure" in path_str or "persistence" in path_str or "caching" in path_str:
-            return "Infrastructure"
-        if "core" in path_str or "orchestrator" in path_str:
-            return "Core"
-        if "api" in path_str or "interface" in path_str:
-            return "Interface"
-        if "model" in path_str or "data" in path_str:
-            return "Data"
-        if "test" in path_str:
-            return "Test"
+        matches = _OWNERSHIP_RE.findall(node._norm_path)
+        if matches:
+            return min(_OWNERSHIP_MAP[m.lower()] for m in matches)[1]
         
         if any("Base" in c for c in node.classes.keys()):
             return "Abstractions"
         
         return "Internal"
 
+    def _build_import_index(self):
+        """Resolves every import once into forward (module -> internal deps) and reverse (module -> importers) indexes."""
+        self._internal_imports = {}
+        importers: Dict[str, Set[str]] = defaultdict(set)
+        for src_name, src_node in self.nodes.items():
+            resolved = []
+            for imp in src_node.imports:
+                target = self._resolve_internal(imp)
+                if target:
+                    resolved.append(target)
+                    if target != src_name:
+                        importers[target].add(src_name)
+            self._internal_imports[src_name] = resolved
+        self._importers = dict(importers)
+
+    def _build_call_index(self):
+        """Reverse call indexes used by get_impact_scope to find callers without scanning every function."""
+        callee_index: Dict[str, List[Tuple[str, str]]] = defaultdict(list)
+        suffix_index: Dict[str, List[Tuple[str, str]]] = defaultdict(list)
+        for mod_name, node in self.nodes.items():
+            for func_name, func_node in node.functions.items():
+                caller = (mod_name, func_name)
+                for call in func_node.calls:
+                    callee_index[call].append(caller)
+                    parts = call.split('.')
+                    for i in range(1, len(parts)):
+                        suffix_index['.'.join(parts[i:])].append(caller)
+        self._callee_index = dict(callee_index)
+        self._callee_suffix_index = dict(suffix_index)
+
+    def _find_callers(self, symbol: str) -> List[Tuple[str, str]]:
+        """Callers whose call equals symbol, is a dotted suffix of it, or ends with '.' + symbol."""
+        callers = list(self._callee_suffix_index.get(symbol, ()))
+        parts = symbol.split('.')
+        for i in range(len(parts)):
+            callers.extend(self._callee_index.get('.'.join(parts[i:]), ()))
+        return callers
+
     def _calculate_metrics(self):
         """Calculates advanced metrics like dependency depth, fan-in/out, and churn."""
+        self._build_import_index()
+        self._depth_cache = {}
+        self._in_stack = set()
         for name, node in self.nodes.items():
             # 1. Fan-out (Imports of internal modules)
-            internal_imports = [imp for imp in node.imports if any(imp.startswith(n) for n in self.nodes.keys())]
-            node.metrics["fan_out"] = len(internal_imports)
+            node.metrics["fan_out"] = len(self._internal_imports.get(name, ()))
             
             # 2. Fan-in (How many modules import this one)
-            fan_in = 0
-            for other_name, other_node in self.nodes.items():
-                if other_name == name: continue
-                if any(imp.startswith(name) for imp in other_node.imports):
-                    fan_in += 1
+            fan_in = len(self._importers.get(name, ()))
             node.metrics["fan_in"] = fan_in
             node.metrics["callers_count"] = fan_in # Approximation
 
@@ -170,38 +438,73 @@ class GraphEngine:
             node.metrics["churn"] = self._get_git_churn(node.file_path)
 
             # 4. Dependency Depth (recursive)
-            node.metrics["dependency_depth"] = self._get_depth(name, set())
+            node.metrics["dependency_depth"] = self._get_depth(name)
 
-    def _get_depth(self, module_name: str, visited: Set[str]) -> int:
-        if module_name in visited: return 0
-        visited.add(module_name)
+    def _get_depth(self, module_name: str) -> int:
+        """Longest internal import chain below module_name, memoized; import cycles are cut at the repeat."""
+        if module_name in self._depth_cache:
+            return self._depth_cache[module_name]
+        if module_name in self._in_stack:
+            return 0
         
         node = self.nodes.get(module_name)
         if not node or not node.imports: return 0
         
+        self._in_stack.add(module_name)
         max_child_depth = 0
-        for imp in node.imports:
-            matched_internal = next((n for n in self.nodes.keys() if imp == n or imp.startswith(n + ".")), None)
-            if matched_internal:
-                max_child_depth = max(max_child_depth, self._get_depth(matched_internal, visited))
+        for matched_internal in self._internal_imports.get(module_name, ()):
+            max_child_depth = max(max_child_depth, self._get_depth(matched_internal))
+        self._in_stack.discard(module_name)
         
-        return 1 + max_child_depth
+        depth = 1 + max_child_depth
+        self._depth_cache[module_name] = depth
+        return depth
 
-    def _get_git_churn(self, file_path: Path) -> int:
-        """Returns commit count for file using git CLI."""
+    def _load_git_churn(self):
+        """Tallies per-file commit counts from a single `git log` pass over the project."""
+        self._churn_map = None
         try:
-            result = subprocess.run(
-                ["git", "rev-list", "--count", "HEAD", str(file_path)],
-                capture_output=True, text=True, cwd=self.root_path, check=False
+            proc = subprocess.Popen(
+                ["git", "-c", "core.quotepath=off", "log", "--pretty=format:", "--name-only", "--relative", "HEAD"],
+                stdout=subprocess.PIPE, stderr=subprocess.DEVNULL, cwd=self.root_path
             )
-            if result.returncode == 0:
-                return int(result.stdout.strip())
-        except Exception:
-            pass
-        return 1
+        except (FileNotFoundError, OSError):
+            return
+        try:
+            churn_map: Dict[str, int] = {}
+            for raw in proc.stdout:
+                # Paths are bytes in git; decode like the filesystem does so non-UTF-8 names still match
+                line = os.fsdecode(raw.strip())
+                if line:
+                    churn_map[line] = churn_map.get(line, 0) + 1
+            if proc.wait() == 0:
+                self._churn_map = churn_map
+        except (OSError, ValueError) as e: # ValueError covers UnicodeDecodeError
+            logger.debug(f"git churn unavailable for {self.root_path}: {e}")
+        finally:
+            proc.stdout.close()
+            if proc.poll() is None:
+                proc.kill()
+                proc.wait()
+
+    def _get_git_churn(self, file_path: Path) -> int:
+        """Returns commit count for file from the batched git history (1 if git is unavailable)."""
+        if self._churn_map is None:
+            return 1
+        try:
+            rel_path = file_path.relative_to(self.root_path).as_posix()
+        except ValueError:
+            return 1
+        return self._churn_map.get(rel_path, 0)
 
     def get_graph_summary(self) -> Dict[str, Any]:
-        """Returns a structured summary of the architecture graph including call hierarchy and metrics."""
+        """
+        Returns a structured summary of the architecture graph including call hierarchy and metrics.
+        Built once per analyze_project() and shared by later callers; treat it as read-only.
+        """
+        if self._summary_cache is not None:
+            return self._summary_cache
+        
         summary = {
             "modules": {},
             "relationships": [],
@@ -220,9 +523,10 @@ class GraphEngine:
             
             summary["layer_stats"][node.ownership] = summary["layer_stats"].get(node.ownership, 0) + 1
             
-            for imp in node.imports:
-                matched_internal = next((n for n in self.nodes.keys() if imp == n or imp.startswith(n + ".")), None)
-                if matched_internal:
+            seen_targets = set()
+            for matched_internal in self._internal_imports.get(name, ()):
+                if matched_internal not in seen_targets:
+                    seen_targets.add(matched_internal)
                     summary["relationships"].append({"from": name, "to": matched_internal, "type": "import"})
 
             for func_name, func_node in node.functions.items():
@@ -232,6 +536,7 @@ class GraphEngine:
                         "to_symbol": call_target
                     })
         
+        self._summary_cache = summary
         return summary
 
     def get_impact_scope(self, target_symbol: str, max_depth: int = 3) -> List[Dict[str, Any]]:
@@ -239,36 +544,34 @@ class GraphEngine:
         Finds all components that depend on or call the target symbol (upward/backward trace).
         """
         impacted = []
-        visited = set()
+        impacted_names: Set[str] = set()
+        visited = {target_symbol}
         
-        # Normalize symbol name (remove module prefix if present)
-        target_name = target_symbol.split('.')[-1]
-        
-        def trace_up(current_symbol: str, depth: int):
-            if depth > max_depth or current_symbol in visited:
-                return
-            visited.add(current_symbol)
-            
-            # Search all functions in all modules for calls to current_symbol
-            for mod_name, node in self.nodes.items():
-                for func_name, func_node in node.functions.items():
-                    full_func_name = f"{mod_name}.{func_name}"
-                    for call in func_node.calls:
-                        # Match logic: if the call contains the symbol name or matches full name
-                        if current_symbol == call or current_symbol.endswith('.' + call) or call.endswith('.' + current_symbol):
-                            if full_func_name not in [i['name'] for i in impacted]:
-                                impacted.append({
-                                    "name": full_func_name,
-                                    "depth": depth,
-                                    "file": str(node.file_path.relative_to(self.root_path))
-                                })
-                            trace_up(full_func_name, depth + 1)
-
-        trace_up(target_symbol, 1)
-        # Also check module-level imports
+        # Breadth-first upward trace over the reverse call index
+        frontier = deque([(target_symbol, 1)])
+        while frontier:
+            current_symbol, depth = frontier.popleft()
+            if depth > max_depth:
+                continue
+            for mod_name, func_name in self._find_callers(current_symbol):
+                full_func_name = f"{mod_name}.{func_name}"
+                if full_func_name not in impacted_names:
+                    impacted_names.add(full_func_name)
+                    impacted.append({
+                        "name": full_func_name,
+                        "depth": depth,
+                        "file": str(self.nodes[mod_name].file_path.relative_to(self.root_path))
+                    })
+                if full_func_name not in visited:
+                    visited.add(full_func_name)
+                    frontier.append((full_func_name, depth + 1))
+
+        # Also check module-level imports (an import matches when it is a dotted prefix of the target)
+        parts = target_symbol.split('.')
+        target_prefixes = {'.'.join(parts[:i]) for i in range(1, len(parts) + 1)}
         for mod_name, node in self.nodes.items():
             for imp in node.imports:
-                if target_symbol == imp or target_symbol.startswith(imp + "."):
+                if imp in target_prefixes:
                     impacted.append({
                         "name": f"Module Import: {mod_name}",
                         "depth": 1,
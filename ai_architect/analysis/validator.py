@@ -4,6 +4,59 @@ import json
 from .graph_engine import GraphEngine
 from ..infrastructure.logging_utils import logger
 
+try:
+    import numpy as np
+    HAS_NUMPY = True
+except ImportError:
+    HAS_NUMPY = False
+
+try:
+    from numba import njit
+    HAS_NUMBA = HAS_NUMPY
+except ImportError:
+    HAS_NUMBA = False
+
+# Below this many edges the JIT compile costs more than the pure-Python DFS.
+NUMBA_EDGE_THRESHOLD = 2000
+
+# Below this many relationships building the layer arrays costs more than the plain loop.
+NUMPY_EDGE_THRESHOLD = 1000
+
+def _find_cycle_from(indptr, indices, color, stack_nodes, stack_edge, start):
+    """
+    Iterative DFS over a CSR graph starting at `start`.
+    color: 0 = unvisited, 1 = on stack, 2 = done.
+    On a back edge, returns the number of ids written to stack_nodes (the DFS path plus the
+    repeated node) and marks the path done; returns 0 when no cycle is reachable.
+    """
+    top = 0
+    stack_nodes[0] = start
+    stack_edge[0] = indptr[start]
+    color[start] = 1
+    while top >= 0:
+        node = stack_nodes[top]
+        edge = stack_edge[top]
+        if edge < indptr[node + 1]:
+            stack_edge[top] = edge + 1
+            neighbor = indices[edge]
+            if color[neighbor] == 1:
+                for i in range(top + 1):
+                    color[stack_nodes[i]] = 2
+                stack_nodes[top + 1] = neighbor
+                return top + 2
+            if color[neighbor] == 0:
+                top += 1
+                stack_nodes[top] = neighbor
+                stack_edge[top] = indptr[neighbor]
+                color[neighbor] = 1
+        else:
+            color[node] = 2
+            top -= 1
+    return 0
+
+if HAS_NUMBA:
+    _find_cycle_from_jit = njit(cache=True)(_find_cycle_from)
+
 class ArchRule:
     def __init__(self, name: str, description: str, severity: str = "Critical"):
         self.name = name
@@ -23,23 +76,39 @@ class NoCyclicImports(ArchRule):
             if r["from"] not in graph: graph[r["from"]] = []
             graph[r["from"]].append(r["to"])
         
-        def has_cycle(node, visited, path):
-            visited.add(node)
-            path.add(node)
-            for neighbor in graph.get(node, []):
-                if neighbor in path:
-                    return True, path | {neighbor}
-                if neighbor not in visited:
-                    res, cycle_path = has_cycle(neighbor, visited, path)
-                    if res: return True, cycle_path
-            path.remove(node)
-            return False, set()
+        # Integer ids + CSR adjacency so the DFS kernel can run without Python objects
+        ids = {}
+        for name in graph:
+            ids[name] = len(ids)
+        for neighbors in graph.values():
+            for name in neighbors:
+                if name not in ids: ids[name] = len(ids)
+        names = list(ids)
+        num_nodes = len(names)
+        indptr = [0] * (num_nodes + 1)
+        indices = []
+        for name, i in ids.items():
+            indices.extend(ids[n] for n in graph.get(name, ()))
+            indptr[i + 1] = len(indices)
+
+        if HAS_NUMBA and len(indices) > NUMBA_EDGE_THRESHOLD:
+            find_cycle = _find_cycle_from_jit
+            indptr, indices = np.asarray(indptr, dtype=np.int32), np.asarray(indices, dtype=np.int32)
+            color = np.zeros(num_nodes, dtype=np.int8)
+            stack_nodes = np.zeros(num_nodes + 1, dtype=np.int32)
+            stack_edge = np.zeros(num_nodes + 1, dtype=np.int32)
+        else:
+            find_cycle = _find_cycle_from
+            color = [0] * num_nodes
+            stack_nodes = [0] * (num_nodes + 1)
+            stack_edge = [0] * (num_nodes + 1)
 
-        visited = set()
         for node in graph:
-            if node not in visited:
-                res, cycle = has_cycle(node, visited, set())
-                if res:
+            start = ids[node]
+            if color[start] == 0:
+                length = find_cycle(indptr, indices, color, stack_nodes, stack_edge, start)
+                if length:
+                    cycle = {names[i] for i in stack_nodes[:length]}
                     violations.append(f"Cyclic dependency detected: {cycle}")
         return violations
 
@@ -61,17 +130,32 @@ class LayeredArchitectureViolation(ArchRule):
         modules = summary.get("modules", {})
         rels = summary.get("relationships", [])
         
-        for rel in rels:
-            from_mod = rel["from"]
-            to_mod = rel["to"]
-            
-            from_layer = modules.get(from_mod, {}).get("ownership")
-            to_layer = modules.get(to_mod, {}).get("ownership")
-            
-            if from_layer and to_layer and from_layer != to_layer:
-                allowed = self.ALLOWED_DOWNWARD.get(from_layer, set())
-                if to_layer not in allowed:
-                    violations.append(f"Layer Violation: {from_mod} ({from_layer}) calls UP to {to_mod} ({to_layer})")
+        # Integer-code layers once per module; -1 marks modules without an ownership
+        layer_ids: Dict[str, int] = {}
+        module_layer: Dict[str, int] = {}
+        for name, info in modules.items():
+            layer = info.get("ownership")
+            module_layer[name] = layer_ids.setdefault(layer, len(layer_ids)) if layer else -1
+        layers = list(layer_ids)
+        allowed = [[a == b or b in self.ALLOWED_DOWNWARD.get(a, ()) for b in layers] for a in layers]
+        
+        if HAS_NUMPY and layers and len(rels) > NUMPY_EDGE_THRESHOLD:
+            from_idx = np.fromiter((module_layer.get(r["from"], -1) for r in rels), dtype=np.int32, count=len(rels))
+            to_idx = np.fromiter((module_layer.get(r["to"], -1) for r in rels), dtype=np.int32, count=len(rels))
+            mask = (from_idx >= 0) & (to_idx >= 0) & ~np.array(allowed, dtype=bool)[from_idx, to_idx]
+            hits = np.nonzero(mask)[0].tolist()
+        else:
+            hits = []
+            for i, rel in enumerate(rels):
+                from_code = module_layer.get(rel["from"], -1)
+                to_code = module_layer.get(rel["to"], -1)
+                if from_code >= 0 and to_code >= 0 and not allowed[from_code][to_code]:
+                    hits.append(i)
+        
+        for i in hits:
+            from_mod, to_mod = rels[i]["from"], rels[i]["to"]
+            from_layer, to_layer = layers[module_layer[from_mod]], layers[module_layer[to_mod]]
+            violations.append(f"Layer Violation: {from_mod} ({from_layer}) calls UP to {to_mod} ({to_layer})")
         
         return violations
 
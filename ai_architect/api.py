@@ -1,148 +1,383 @@
+import os
 import time
-from fastapi import FastAPI, HTTPException, Depends, Request
-from pydantic import BaseModel
+import asyncio
+import hashlib
+import hmac
+import functools
+import orjson
+from pathlib import Path
+from contextlib import asynccontextmanager
+from concurrent.futures import ThreadPoolExecutor
+from anyio import to_thread
+from fastapi import FastAPI, HTTPException, Depends, Request, Response
+from fastapi.responses import StreamingResponse
+from fastapi.security import APIKeyHeader
+from pydantic import BaseModel, ConfigDict
 from typing import Dict, Any, Optional
-from .core_ai.auditor import ArchitecturalAuditor
-from .infrastructure.logging_utils import logger
+from .infrastructure.logging_utils import logger, start_queue_logging, stop_queue_logging
 from .infrastructure.config_manager import config
-from .infrastructure.monitoring import monitor
-from .infrastructure.caching import cached
+from .infrastructure.caching import cache
+from .data.models import SprintPlanConfig, WDPOutput
+from .version import ARCHAI_VERSION, get_graph_core_hash
 
 from starlette.middleware.sessions import SessionMiddleware
+from fastapi.middleware.gzip import GZipMiddleware
+
+# This module shadows the api/ directory next to it; a __path__ makes ai_architect.api a
+# package for import purposes, so its api/auth.py resolves as ai_architect.api.auth
+__path__ = [os.path.join(os.path.dirname(__file__), "api")]
 from .api import auth
 
-app = FastAPI(title="ArchAI API", description="REST API for Autonomous Architectural Audits")
+# Worker threads for blocking auditor/LLM/GitHub calls (asyncio.to_thread) and sync
+# endpoints/dependencies (anyio); the defaults (~40) stall under concurrent audits.
+API_THREADPOOL_SIZE = 100
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    asyncio.get_running_loop().set_default_executor(ThreadPoolExecutor(max_workers=API_THREADPOOL_SIZE))
+    to_thread.current_default_thread_limiter().total_tokens = API_THREADPOOL_SIZE
+    # Request logs are formatted and written by a background listener, off the event loop
+    listener = start_queue_logging(logger)
+    # Build the shared auditor before serving and load its model in the background,
+    # so neither the import chain nor Ollama's cold model load lands on the first request
+    app.state.auditor = await asyncio.to_thread(get_auditor)
+    warmup = asyncio.create_task(asyncio.to_thread(app.state.auditor.model.warmup))
+    try:
+        yield
+    finally:
+        warmup.cancel()
+        stop_queue_logging(listener, logger)
+
+app = FastAPI(title="ArchAI API", description="REST API for Autonomous Architectural Audits", lifespan=lifespan)
 
 # Add Session Middleware for OAuth
-app.add_middleware(SessionMiddleware, secret_key=config.get_secret("session_secret", "archai-dev-secret"))
+app.add_middleware(SessionMiddleware, secret_key=config.get_secret("session_secret") or "archai-dev-secret")
+
+# Compress JSON bodies (audit reports are tens of KB of repetitive keys); tiny responses pass through
+app.add_middleware(GZipMiddleware, minimum_size=1024, compresslevel=5)
 
 # Register Auth Router
 app.include_router(auth.router)
 
 API_KEY = config.get("api_key", "archai-secret-key")
-api_key_header = APIKeyHeader(name="X-API-Key")
-
-def get_api_key(api_key: str = Depends(api_key_header)):
-    if api_key != API_KEY:
-        raise HTTPException(status_code=403, detail="Invalid API Key")
-    return api_key
-
-@app.middleware("http")
-async def log_requests(request: Request, call_next):
-    start_time = time.time()
-    response = await call_next(request)
-    duration = (time.time() - start_time) * 1000
-    logger.info(f"HTTP {request.method} {request.url.path} - {response.status_code} ({duration:.2f}ms)")
-    return response
-
-class AuditRequest(BaseModel):
+_API_KEY_BYTES = API_KEY.encode("utf-8")
+api_key_header = APIKeyHeader(name="X-API-Key", auto_error=False)
+
+async def get_api_key(request: Request, api_key: Optional[str] = Depends(api_key_header)):
+    # Constant-time compare so the key cannot be recovered from response timing
+    if api_key and hmac.compare_digest(api_key.encode("utf-8"), _API_KEY_BYTES):
+        return api_key
+    # OAuth browser sessions count only for allowlisted accounts with a live session in Redis
+    if await auth.get_session(request) is not None:
+        return api_key
+    raise HTTPException(status_code=403, detail="Invalid API Key")
+
+# Shared by every protected route
+API_KEY_DEP = Depends(get_api_key)
+
+class TimingMiddleware:
+    """Pure ASGI request timing/logging; avoids BaseHTTPMiddleware's per-request task and streams."""
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            return await self.app(scope, receive, send)
+        loop = asyncio.get_running_loop()
+        start_time = loop.time()
+        status_code = 500
+
+        async def send_wrapper(message):
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            duration = (loop.time() - start_time) * 1000
+            logger.info("HTTP %s %s - %d (%.2fms)", scope["method"], scope["path"], status_code, duration)
+
+app.add_middleware(TimingMiddleware)
+
+class APIRequest(BaseModel):
+    """Request bodies are validated once and never mutated; frozen models are hashable by value."""
+    model_config = ConfigDict(frozen=True)
+
+class AuditRequest(APIRequest):
     path: str
     context: Optional[str] = "General software project"
     goal: Optional[str] = "Production-ready system"
 
-class ImpactRequest(BaseModel):
+class ImpactRequest(APIRequest):
     path: str
     target: str
     depth: int = 3
 
-class PlanRequest(BaseModel):
+class PlanRequest(APIRequest):
     path: str
     goal: str
     team_size: int = 3
     days: int = 10
 
-class SimulationRequest(BaseModel):
+class SimulationRequest(APIRequest):
     path: str
     goal: str
     team_size: int = 3
     days: int = 10
     strict: bool = False
 
-class GitHubPRListRequest(BaseModel):
+class GitHubPRListRequest(APIRequest):
     repo: str
 
-class GitHubPRAnalyzeRequest(BaseModel):
+class GitHubPRAnalyzeRequest(APIRequest):
     repo: str
     pr_number: int
     path: str
     comment: bool = False
 
-    # Make hashable for caching key generation
-    def __hash__(self):
-        return hash((self.path, self.context, self.goal))
+IGNORE_DIRS = {'.git', '__pycache__', '.venv', 'venv', 'env', 'node_modules', 'dist', 'build'}
+
+# Files the audit reads (scan_directory's relevant files plus the Python sources the graph parses);
+# any change to one of them changes the fingerprint
+FINGERPRINT_EXTENSIONS = {'.py', '.md', '.sql', '.yaml', '.yml', '.json', '.toml', '.env'}
+FINGERPRINT_NAMES = {'Dockerfile'}
+
+def _json_response(payload: Any, headers: Optional[Dict[str, str]] = None) -> Response:
+    """Encodes large report payloads with orjson instead of the jsonable_encoder + json.dumps path."""
+    return Response(content=orjson.dumps(payload, option=orjson.OPT_NON_STR_KEYS), media_type="application/json", headers=headers)
+
+def _ndjson_report(report: Dict[str, Any]):
+    """Yields an audit report as NDJSON: one line per task, one per sprint day, then the remaining fields."""
+    for task in report.get("tasks", ()):
+        yield orjson.dumps({"section": "task", **task}, option=orjson.OPT_NON_STR_KEYS) + b"\n"
+    for day in report.get("sprintPlan", ()):
+        yield orjson.dumps({"section": "sprint_day", **day}, option=orjson.OPT_NON_STR_KEYS) + b"\n"
+    rest = {k: v for k, v in report.items() if k not in ("tasks", "sprintPlan")}
+    yield orjson.dumps({"section": "summary", **rest}, option=orjson.OPT_NON_STR_KEYS) + b"\n"
+
+def _report_response(report: Dict[str, Any], raw_request: Request, etag: str) -> Response:
+    """Streams the report as NDJSON for clients that accept it, otherwise one orjson body."""
+    if "application/x-ndjson" in raw_request.headers.get("accept", ""):
+        return StreamingResponse(_ndjson_report(report), media_type="application/x-ndjson", headers={"ETag": etag})
+    return _json_response(report, headers={"ETag": etag})
+
+def _etag_matches(if_none_match: Optional[str], etag: str) -> bool:
+    """
+    If-None-Match evaluation per RFC 9110 13.1.2: "*" or a comma-separated list of entity tags,
+    compared weakly (a W/ prefix on either side is ignored). Only call it when a report exists.
+    """
+    if not if_none_match:
+        return False
+    if if_none_match.strip() == "*":
+        return True
+    opaque = etag.removeprefix("W/")
+    return any(tag.strip().removeprefix("W/") == opaque for tag in if_none_match.split(","))
+
+def _repo_fingerprint(root: Path) -> str:
+    """Fingerprint of a source tree from (relative path, mtime, size) of each file the audit reads."""
+    entries = []
+    for dirpath, dirnames, filenames in os.walk(root):
+        dirnames[:] = [d for d in dirnames if d not in IGNORE_DIRS]
+        for fn in filenames:
+            if os.path.splitext(fn)[1].lower() not in FINGERPRINT_EXTENSIONS and fn not in FINGERPRINT_NAMES:
+                continue
+            full_path = os.path.join(dirpath, fn)
+            try:
+                st = os.stat(full_path)
+            except OSError:
+                continue
+            entries.append(f"{os.path.relpath(full_path, root)}:{st.st_mtime_ns}:{st.st_size}")
+    entries.sort()
+    return hashlib.blake2b("\n".join(entries).encode("utf-8"), digest_size=16).hexdigest()
+
+async def _fingerprint(path: str) -> str:
+    """_repo_fingerprint off the event loop; the walk is blocking filesystem I/O."""
+    return await asyncio.to_thread(_repo_fingerprint, Path(path))
 
 @app.get("/health")
 def health_check():
     return {"status": "online", "model": config.get("model", "qwen3-coder:480b-cloud")}
 
-@app.get("/metrics", dependencies=[Depends(get_api_key)])
-@cached(prefix="metrics", ttl=10) # Cache metrics for 10 seconds to reduce DB load
-async def get_metrics():
+# Heavy modules (auditor -> LLM clients/GraphEngine, monitor -> DB engine, GitHub connector)
+# are imported once, on the cold path of the getters below, never at module import time;
+# the lifespan handler pays for the auditor during startup, before traffic is accepted.
+
+_auditor = None
+
+def get_auditor():
+    """Process-wide ArchitecturalAuditor, built on first use; it only holds the model client."""
+    global _auditor
+    if _auditor is None:
+        from .core_ai.auditor import ArchitecturalAuditor
+        _auditor = ArchitecturalAuditor()
+    return _auditor
+
+# WDP plans come from the LLM and differ between runs; a cached plan is reused for this many
+# seconds so /plan, /simulate-sprint and /release-confidence agree with each other
+PLAN_TTL = 300
+
+@functools.cache
+def _planner_version() -> str:
+    return f"{ARCHAI_VERSION}:{get_graph_core_hash()}"
+
+def _model_key() -> list:
+    """Identifies the model behind get_auditor() in cache keys; a different model means a different result."""
+    model = get_auditor().model
+    return [type(model).__name__, getattr(model, "model_name", None)]
+
+async def _get_or_plan(path: str, goal: str, sprint_config, response: Optional[Response] = None):
+    """
+    WDP plan shared by /plan, /simulate-sprint and /release-confidence. Keyed on every input
+    that shapes the plan: request, repo fingerprint, model and planner code. When response is
+    given, X-Cache (HIT/MISS), Age and Cache-Control: max-age tell the client how long the plan is reused.
+    """
+    key_data = {
+        "path": path,
+        "goal": goal,
+        "sprint_config": sprint_config,
+        "fingerprint": await _fingerprint(path),
+        "model": _model_key(),
+        "planner": _planner_version()
+    }
+    entry = await cache.aget("wdp_plan", key_data)
+    if entry is not None:
+        plan, age = WDPOutput(**entry["plan"]), max(0, int(time.time() - entry["created_at"]))
+    else:
+        plan, age = await asyncio.to_thread(get_auditor().WDPPlanner, path, goal, sprint_config=sprint_config), 0
+        # Dumped here: the cache serializer only converts a top-level model, not one nested in the entry
+        await cache.aset("wdp_plan", key_data, {"created_at": time.time(), "plan": plan.model_dump(mode="json")}, ttl=PLAN_TTL)
+
+    if response is not None:
+        response.headers["X-Cache"] = "HIT" if entry is not None else "MISS"
+        response.headers["Age"] = str(age)
+        response.headers["Cache-Control"] = f"private, max-age={max(0, PLAN_TTL - age)}"
+    return plan
+
+async def get_github_connector(request: Request):
+    """One GitHubConnector per process on app.state, so its pooled GitHub session and TLS connections are reused."""
+    connector = getattr(request.app.state, "github", None)
+    if connector is None:
+        from .connectors.github import GitHubConnector
+        connector = GitHubConnector(auditor=get_auditor())
+        request.app.state.github = connector
+    return connector
+
+async def _simulate(request: SimulationRequest, response: Response):
+    config = SprintPlanConfig(team_size=request.team_size, days=request.days)
+    plan = await _get_or_plan(request.path, request.goal, config, response)
+    return await asyncio.to_thread(get_auditor().SRCEngine, request.path, request.goal, wdp_plan=plan, sprint_config=config, strict=request.strict)
+
+# Metrics are cached (shared across workers when Redis is configured) for this many seconds to reduce DB load
+METRICS_TTL = 10
+
+@app.get("/metrics", dependencies=[API_KEY_DEP])
+async def get_metrics(response: Response):
     """Returns real-time performance and health metrics."""
-    return monitor.get_system_health()
+    response.headers["Cache-Control"] = f"max-age={METRICS_TTL}"
+    cached_health = await cache.aget("metrics", "system_health")
+    if cached_health is not None:
+        return cached_health
+    from .infrastructure.monitoring import monitor
+    health = await asyncio.to_thread(monitor.get_system_health)
+    await cache.aset("metrics", "system_health", health, ttl=METRICS_TTL)
+    return health
 
-@app.post("/impact", dependencies=[Depends(get_api_key)])
+@app.post("/impact", dependencies=[API_KEY_DEP])
 async def run_impact(request: ImpactRequest):
     """CIRAS: Change Impact & Risk Assessment."""
-    auditor = ArchitecturalAuditor()
-    return auditor.ImpactAnalyzer(request.path, request.target, max_depth=request.depth)
-
-@app.post("/plan", dependencies=[Depends(get_api_key)])
-async def run_plan(request: PlanRequest):
-    """WDP-TG: Work Decomposition & Task Generation."""
-    from .data.models import SprintPlanConfig
-    auditor = ArchitecturalAuditor()
+    key_data = {
+        "path": request.path,
+        "target": request.target,
+        "depth": request.depth,
+        "fingerprint": await _fingerprint(request.path)
+    }
+    cached_assessment = await cache.aget("impact", key_data)
+    if cached_assessment is not None:
+        return cached_assessment
+
+    assessment = await asyncio.to_thread(get_auditor().ImpactAnalyzer, request.path, request.target, max_depth=request.depth)
+    await cache.aset("impact", key_data, assessment, ttl=300)
+    return assessment
+
+@app.post("/plan", dependencies=[API_KEY_DEP])
+async def run_plan(request: PlanRequest, response: Response):
+    """WDP-TG: Work Decomposition & Task Generation. Plans are reused for PLAN_TTL seconds (see X-Cache/Age)."""
     config = SprintPlanConfig(team_size=request.team_size, days=request.days)
-    return auditor.WDPPlanner(request.path, request.goal, sprint_config=config)
+    return await _get_or_plan(request.path, request.goal, config, response)
 
-@app.post("/simulate-sprint", dependencies=[Depends(get_api_key)])
-async def run_simulation(request: SimulationRequest):
+@app.post("/simulate-sprint", dependencies=[API_KEY_DEP])
+async def run_simulation(request: SimulationRequest, response: Response):
     """SRC-RS: Sprint Success Simulation."""
-    from .data.models import SprintPlanConfig
-    auditor = ArchitecturalAuditor()
-    config = SprintPlanConfig(team_size=request.team_size, days=request.days)
-    plan = auditor.WDPPlanner(request.path, request.goal, sprint_config=config)
-    return auditor.SRCEngine(request.path, request.goal, wdp_plan=plan, sprint_config=config, strict=request.strict)
+    return await _simulate(request, response)
 
-@app.post("/release-confidence", dependencies=[Depends(get_api_key)])
-async def run_release_confidence(request: SimulationRequest):
+@app.post("/release-confidence", dependencies=[API_KEY_DEP])
+async def run_release_confidence(request: SimulationRequest, response: Response):
     """SRC-RS: Release Integrity Assessment."""
-    return await run_simulation(request)
+    return await _simulate(request, response)
 
-@app.post("/github/prs", dependencies=[Depends(get_api_key)])
-async def list_github_prs(request: GitHubPRListRequest):
+@app.post("/github/prs", dependencies=[API_KEY_DEP])
+async def list_github_prs(request: GitHubPRListRequest, connector=Depends(get_github_connector)):
     """Lists open pull requests for a repository."""
-    from .connectors.github import GitHubConnector
-    connector = GitHubConnector()
-    return connector.fetch_open_prs(request.repo)
+    return await asyncio.to_thread(connector.fetch_open_prs, request.repo)
 
-@app.post("/github/analyze-pr", dependencies=[Depends(get_api_key)])
-async def analyze_github_pr(request: GitHubPRAnalyzeRequest):
+@app.post("/github/analyze-pr", dependencies=[API_KEY_DEP])
+async def analyze_github_pr(request: GitHubPRAnalyzeRequest, connector=Depends(get_github_connector)):
     """Analyzes a specific GitHub PR and optionally posts a comment."""
-    from .connectors.github import GitHubConnector
-    connector = GitHubConnector()
-    report = connector.analyze_pr(request.repo, request.pr_number, request.path)
+    report = await asyncio.to_thread(connector.analyze_pr, request.repo, request.pr_number, request.path)
     if report and request.comment:
-        connector.post_pr_comment(request.repo, request.pr_number, report)
+        await asyncio.to_thread(connector.post_pr_comment, request.repo, request.pr_number, report)
     return report
 
-@app.post("/audit", dependencies=[Depends(get_api_key)])
-@cached(prefix="full_audit", ttl=300) # Cache identical audit requests for 5 minutes
-async def run_audit(request: AuditRequest):
-    """Triggers an asynchronous architectural audit."""
+@app.post("/audit", dependencies=[API_KEY_DEP])
+async def run_audit(request: AuditRequest, raw_request: Request):
+    """
+    Triggers an asynchronous architectural audit.
+    Reports are keyed by the repo's content fingerprint, model and planner code, so edits invalidate
+    them immediately; clients re-polling with If-None-Match get a 304 while that report is still cached.
+    Send Accept: application/x-ndjson to receive the report streamed one task/sprint day per line.
+    """
     logger.info(f"API Request: Audit path {request.path}")
-    auditor = ArchitecturalAuditor()
+    key_data = {
+        "path": request.path,
+        "context": request.context,
+        "goal": request.goal,
+        "fingerprint": await _fingerprint(request.path),
+        "model": _model_key(),
+        "planner": _planner_version()
+    }
+    etag = '"' + hashlib.blake2b(repr(sorted(key_data.items())).encode("utf-8"), digest_size=16).hexdigest() + '"'
+
+    # A 304 tells the client its copy is current, which only holds while the report is cached
+    cached_report = await cache.aget("full_audit", key_data)
+    if cached_report is not None:
+        if _etag_matches(raw_request.headers.get("if-none-match"), etag):
+            return Response(status_code=304, headers={"ETag": etag})
+        return _report_response(cached_report, raw_request, etag)
+
     try:
-        report = await auditor.audit_project(
+        report = await get_auditor().audit_project(
             root_path=request.path,
             user_context=request.context,
             expected_output=request.goal
         )
-        return report
+        await cache.aset("full_audit", key_data, report, ttl=300) # Cache identical audit requests for 5 minutes
+        return _report_response(report, raw_request, etag)
     except Exception as e:
         logger.error(f"API Audit Error: {e}")
         raise HTTPException(status_code=500, detail=str(e))
 
 if __name__ == "__main__":
     import uvicorn
-    uvicorn.run(app, host="0.0.0.0", port=8000)
+    # "auto" picks uvloop/httptools when uvicorn[standard] is installed and falls back otherwise.
+    # One worker unless api.workers asks for more: each worker has its own auditor, graph pool and local cache.
+    uvicorn.run(
+        "ai_architect.api:app",
+        host="0.0.0.0",
+        port=8000,
+        loop="auto",
+        http="auto",
+        workers=int(config.get("api.workers", 1))
+    )
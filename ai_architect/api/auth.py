@@ -2,13 +2,51 @@ from fastapi import APIRouter, Request, Depends, HTTPException
 from authlib.integrations.starlette_client import OAuth
 from starlette.responses import RedirectResponse
 from ..infrastructure.config_manager import config
+from ..infrastructure.caching import cache
 import logging
+import secrets
 
 logger = logging.getLogger("ArchAI.Auth")
 router = APIRouter(prefix="/auth", tags=["Authentication"])
 
 oauth = OAuth()
 
+def _config_list(key: str) -> set:
+    """Reads a list setting from YAML or a comma-separated ARCHAI_* env var, lowercased."""
+    value = config.get(key) or []
+    if isinstance(value, str):
+        value = value.split(",")
+    return {str(v).strip().lower() for v in value if str(v).strip()}
+
+def _identity(provider: str, user: dict, orgs: list) -> dict:
+    # Only Google vouches for the address (email_verified); a GitHub profile email is user-chosen
+    email = user.get('email') if provider == 'google' and user.get('email_verified') else None
+    return {
+        "provider": provider,
+        "login": (user.get('login') or '').lower() or None,
+        "email": (email or '').lower() or None,
+        "orgs": [o.lower() for o in orgs],
+    }
+
+def is_allowed(identity: dict) -> bool:
+    """
+    Checks an OAuth identity against auth.allowed_users (GitHub logins or Google emails),
+    auth.allowed_orgs (GitHub orgs) and auth.allowed_domains (email domains).
+    Nothing configured means nobody is allowed: signing in alone never grants API access.
+    """
+    users, orgs, domains = _config_list("auth.allowed_users"), _config_list("auth.allowed_orgs"), _config_list("auth.allowed_domains")
+    email = identity.get("email")
+    if identity.get("login") in users or (email and email in users):
+        return True
+    if email and email.rsplit("@", 1)[-1] in domains:
+        return True
+    return bool(orgs.intersection(identity.get("orgs", ())))
+
+def _require_session_store():
+    # The local fallback is per-worker memory; sessions need a shared store that enforces TTLs
+    if cache.async_redis_client is None:
+        raise HTTPException(status_code=503, detail="OAuth login requires a Redis session store (cache.redis_url)")
+
 # Google OAuth Configuration
 oauth.register(
     name='google',
@@ -28,11 +66,12 @@ oauth.register(
     authorize_url='https://github.com/login/oauth/authorize',
     authorize_params=None,
     api_base_url='https://api.github.com/',
-    client_kwargs={'scope': 'user:email'}
+    client_kwargs={'scope': 'user:email read:org'}
 )
 
 @router.get('/login/{provider}')
 async def login(provider: str, request: Request):
+    _require_session_store()
     redirect_uri = request.url_for('auth_callback', provider=provider)
     if provider == 'google':
         return await oauth.google.authorize_redirect(request, redirect_uri)
@@ -42,6 +81,8 @@ async def login(provider: str, request: Request):
 
 @router.get('/callback/{provider}', name='auth_callback')
 async def auth_callback(provider: str, request: Request):
+    _require_session_store()
+    orgs = []
     if provider == 'google':
         token = await oauth.google.authorize_access_token(request)
         user = token.get('userinfo')
@@ -49,9 +90,22 @@ async def auth_callback(provider: str, request: Request):
         token = await oauth.github.authorize_access_token(request)
         resp = await oauth.github.get('user', token=token)
         user = resp.json()
+        if _config_list("auth.allowed_orgs"):
+            resp = await oauth.github.get('user/orgs', token=token)
+            orgs = [o.get('login', '') for o in resp.json()] if resp.status_code == 200 else []
+    else:
+        raise HTTPException(status_code=400, detail="Invalid provider")
+
+    identity = _identity(provider, dict(user), orgs)
+    if not is_allowed(identity):
+        logger.warning(f"Rejected {provider} login for {identity['email'] or identity['login']}: not in the auth allowlist")
+        raise HTTPException(status_code=403, detail="This account is not allowed to use ArchAI")
     
-    # In a production environment, we would issue a JWT here.
-    # For now, we'll store the token/user info for the backup service.
+    # Persist token/user server-side in Redis for as long as the token lives;
+    # the signed session cookie only carries the session id.
+    sid = secrets.token_urlsafe(32)
+    request.session['sid'] = sid
+    await cache.aset("session", sid, {"provider": provider, "user": dict(user), "identity": identity, "token": dict(token)}, ttl=int(token.get('expires_in') or 3600))
     logger.info(f"User {user.get('email') or user.get('login')} logged in via {provider}")
     
     # Redirect back to the dashboard with a success flag
@@ -59,5 +113,20 @@ async def auth_callback(provider: str, request: Request):
 
 @router.get('/logout')
 async def logout(request: Request):
-    request.session.pop('user', None)
+    sid = request.session.pop('sid', None)
+    if sid:
+        await cache.adelete("session", sid)
     return RedirectResponse(url='/')
+
+async def get_session(request: Request):
+    """
+    Returns the stored {provider, user, identity, token} for the caller's session, or None.
+    The allowlist is re-checked on every call, so removing an account revokes its open sessions.
+    """
+    sid = request.session.get('sid') if 'session' in request.scope else None
+    if not sid or cache.async_redis_client is None:
+        return None
+    record = await cache.aget("session", sid)
+    if not record or not is_allowed(record.get("identity") or {}):
+        return None
+    return record
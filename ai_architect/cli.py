@@ -4,25 +4,29 @@ import os
 import shlex
 import json
 import argparse
+import re
+import functools
 import logging
+import time
 from datetime import datetime
 from pathlib import Path
-from typing import Optional, List, Dict, Any
-
-from ai_architect.core_ai.generator import CoreAI
-from ai_architect.evaluations.runner import EvaluationRunner
-from ai_architect.improvement_engine.analyzer import ImprovementEngine
-from ai_architect.reconciler.logic import Reconciler
-from ai_architect.core_ai.auditor import ArchitecturalAuditor
-from ai_architect.utils.ollama_manager import initialize_ollama
-from ai_architect.analysis.validator import ArchValidator
+from types import MappingProxyType
+from concurrent.futures import ThreadPoolExecutor, wait as futures_wait
+from urllib.parse import urlsplit
+from typing import Optional, List, Dict, Any, Tuple
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+try:
+    import ijson
+except ImportError:
+    ijson = None
+
 from ai_architect.utils.console_utils import ConsoleUI
 from ai_architect.infrastructure.config_manager import config
-from ai_architect.connectors.github import GitHubConnector
-from ai_architect.connectors.google_drive import GoogleDriveConnector
-from ai_architect.connectors.pm import PMConnector
-from ai_architect.infrastructure.usage_tracker import BackupManager, UsageTracker
-from ai_architect.data.models import SprintPlanConfig, WDPOutput, AuditTicket
 from ai_architect.version import ARCHAI_VERSION, get_graph_core_hash
 from ai_architect.utils.license import LicenseManager
 
@@ -30,38 +34,426 @@ from ai_architect.utils.license import LicenseManager
 logging.basicConfig(level=logging.WARNING, format='%(asctime)s [%(levelname)s] %(name)s: %(message)s')
 logger = logging.getLogger("ArchAI.CLI")
 
+# Shared read-only stand-in for missing nested report fields
+_EMPTY = MappingProxyType({})
+
+# Horizontal rules and the fixed footer printed after every audit forecast
+_RULE = "=" * 80
+_FORECAST_FOOTER = (
+    "\n" + "=" * 70 + "\n"
+    "SUGGESTED NEXT STEP: Use 'trace <ID>' to see evidence for specific tickets.\n"
+    "ALTERNATELY: Use 'impact <path> <symbol>' to analyze risks of identified areas.\n"
+    "Use 'explain' for a detailed summary.\n"
+)
+
+# Console command reference, formatted once for HELP and console startup
+_HELP_ROWS = (
+    ("PLAN", "Generate actionable tasks (WDP-TG) for a goal"),
+    ("IMPACT", "Assess risk (CIRAS) for a file or symbol"),
+    ("AUDIT", "Full architectural audit and sprint planning"),
+    ("GITHUB", "Interact with GitHub (CONNECT, PRS, ANALYZE)"),
+    ("TRACE", "Show evidence trail for a specific ticket ID"),
+    ("SIMULATE", "Simulate success for a goal or specific ticket ID"),
+    ("EXPLAIN", "Justify decisions (PRIORITY, EFFORT, RISK, DEP)"),
+    ("RELEASE-CONFIDENCE", "Evaluate integrity of a release target"),
+    ("G-REASON", "Deterministic graph-based architectural reasoning"),
+    ("SET-GITHUB-TOKEN", "Securely register GitHub Personal Access Token"),
+    ("SET-PM-TOKEN", "Securely register Jira/Trello credentials"),
+    ("CONFIG", "View current configuration and integrations"),
+    ("HELP", "Show this command context table"),
+    ("EXIT / PHIR-MILTY-HAIN", "Terminate the ArchAI console session"),
+)
+_HELP_TABLE = "".join((
+    "\n", _RULE, "\n",
+    f"{'COMMAND':<25} | {'DESCRIPTION':<50}\n",
+    f"{'-'*25}-+-{'-'*50}\n",
+    *(f"{name:<25} | {desc}\n" for name, desc in _HELP_ROWS),
+    _RULE, "\n\n",
+))
+
+# Status markers by level; anything unrecognized keeps the old ternary fallbacks
+_RISK_COLOR = {"HIGH": "🔴", "MEDIUM": "🟡"}
+_CONF_COLOR = {"HIGH": "🟢", "MEDIUM": "🟡"}
+
+# Characters that need shlex; lines without them split the same way with str.split
+_SHELL_QUOTING = frozenset("\"'\\")
+
+# Buffer size for streamed report reads (the 8 KiB default splits large files into many syscalls)
+IO_BUFFER_SIZE = 128 * 1024
+
 class SafeArgumentParser(argparse.ArgumentParser):
     def error(self, message):
         raise ValueError(message)
 
+def _build_audit_parser() -> SafeArgumentParser:
+    parser = SafeArgumentParser(prog="AUDIT", add_help=False)
+    # Defaults to the working directory at parse time, not at import time
+    parser.add_argument("path", nargs="?", default=None)
+    parser.add_argument("--goal", type=str, help="Specific architectural goal for the audit")
+    parser.add_argument("--verbose", action="store_true")
+    parser.add_argument("--diagnostics", action="store_true")
+    return parser
+
+def _build_plan_parser() -> SafeArgumentParser:
+    parser = SafeArgumentParser(prog="PLAN", add_help=False)
+    parser.add_argument("path", help="Project path")
+    parser.add_argument("goal", help="Engineering goal")
+    parser.add_argument("--team-size", type=int, default=3)
+    parser.add_argument("--days", type=int, default=5)
+    parser.add_argument("--velocity", type=float, default=0.8)
+    return parser
+
+def _build_simulate_parser(command: str) -> SafeArgumentParser:
+    parser = SafeArgumentParser(prog=command, add_help=False)
+    parser.add_argument("target", nargs="*", help="Path and Goal OR Ticket ID")
+    parser.add_argument("--team-size", type=int, default=3)
+    parser.add_argument("--days", type=int, default=5)
+    parser.add_argument("--velocity", type=float, default=0.8)
+    return parser
+
+# Console command parsers, built once per process rather than on every REPL command
+_AUDIT_PARSER = _build_audit_parser()
+_PLAN_PARSER = _build_plan_parser()
+_SIMULATE_PARSERS = {cmd: _build_simulate_parser(cmd) for cmd in ("SIMULATE", "RELEASE-CONFIDENCE")}
+
+def _dump_json(data: Any) -> bytes:
+    """Serializes an artifact to indented JSON bytes in one call (orjson when installed)."""
+    if orjson is not None:
+        return orjson.dumps(data, option=orjson.OPT_INDENT_2 | orjson.OPT_NON_STR_KEYS)
+    return json.dumps(data, indent=2).encode("utf-8")
+
+def _read_json(path: str) -> Any:
+    """Loads a JSON artifact with a single read."""
+    raw = Path(path).read_bytes()
+    return orjson.loads(raw) if orjson is not None else json.loads(raw)
+
+def _dump_line(entry: Dict[str, Any]) -> bytes:
+    if orjson is not None:
+        return orjson.dumps(entry) + b"\n"
+    return json.dumps(entry).encode("utf-8") + b"\n"
+
+def _feedback_timestamp(value: Any = None) -> Optional[float]:
+    """
+    The one timestamp format of the feedback log: float epoch seconds (time.time()).
+    None means now; numbers pass through; legacy str(datetime.now()) values are converted
+    (as local time, like they were written). Anything unparseable becomes None.
+    """
+    if value is None:
+        return time.time()
+    if isinstance(value, (int, float)) and not isinstance(value, bool):
+        return float(value)
+    try:
+        return datetime.fromisoformat(str(value)).timestamp()
+    except ValueError:
+        return None
+
 def save_feedback(useful: bool, rejected_ids: List[str]):
-    feedback_file = "archai_feedback.json"
-    data = []
-    if os.path.exists(feedback_file):
-        try:
-            with open(feedback_file, "r") as f:
-                data = json.load(f)
-        except: data = []
-    
+    """Appends one feedback entry to the JSONL history; earlier entries are never re-read."""
     entry = {
-        "timestamp": str(datetime.now()),
+        "timestamp": _feedback_timestamp(),
         "useful": useful,
         "rejected_ids": rejected_ids
     }
-    data.append(entry)
-    with open(feedback_file, "w") as f:
-        json.dump(data, f, indent=4)
+    with open("archai_feedback.jsonl", "ab") as f:
+        f.write(_dump_line(entry))
+
+def migrate_legacy_feedback(legacy_file: str = "archai_feedback.json", feedback_file: str = "archai_feedback.jsonl"):
+    """
+    Moves entries from the old JSON-array feedback file ahead of any JSONL history, then removes it.
+    Legacy string timestamps are converted to the log's epoch-seconds format on the way.
+    """
+    try:
+        legacy = _read_json(legacy_file)
+    except FileNotFoundError:
+        return
+    except ValueError as e:
+        logger.warning(f"Skipping unreadable legacy feedback file {legacy_file}: {e}")
+        return
+    try:
+        existing = Path(feedback_file).read_bytes()
+    except FileNotFoundError:
+        existing = b""
+    entries = [
+        {**entry, "timestamp": _feedback_timestamp(entry["timestamp"])} if isinstance(entry, dict) and entry.get("timestamp") is not None else entry
+        for entry in (legacy if isinstance(legacy, list) else [])
+    ]
+    Path(feedback_file).write_bytes(b"".join(_dump_line(entry) for entry in entries) + existing)
+    os.remove(legacy_file)
+
+@functools.cache
+def _get_github():
+    """GitHub connector for the session; imported and built on the first GITHUB command."""
+    from ai_architect.connectors.github import GitHubConnector
+    return GitHubConnector()
+
+@functools.cache
+def _get_auditor():
+    """Auditor shared by the console's model-backed commands; it holds no per-command state."""
+    from ai_architect.core_ai.auditor import ArchitecturalAuditor
+    from ai_architect.models.factory import get_model
+    return ArchitecturalAuditor(model=get_model(model_name=_runtime_model))
+
+# Model selected by the Ollama runtime check; None until a model-backed command has run
+_runtime_model: Optional[str] = None
+
+def _require_runtime():
+    """
+    Checks the Ollama runtime once per process for model-backed commands and points the shared
+    auditor at the model it selected. Called from the command handler on the main thread,
+    before any spinner or worker, since it may prompt or exit.
+    """
+    global _runtime_model
+    from ai_architect.utils.ollama_manager import ensure_ollama
+    selected = ensure_ollama()
+    if selected != _runtime_model:
+        _runtime_model = selected
+        _get_auditor.cache_clear()
+
+# GitHub owner (letters, digits, hyphens) / repository name (also '.' and '_')
+_REPO_NAME_RE = re.compile(r"[A-Za-z0-9-]+/[A-Za-z0-9._-]+")
+_GITHUB_HOSTS = {"github.com", "www.github.com"}
+
+def _repo_full_name(repo: str) -> str:
+    """
+    Accepts owner/repo, a GitHub URL (any scheme, optional .git or trailing slash) or the
+    git@github.com:owner/repo.git SSH form and returns owner/repo. Raises ValueError otherwise.
+    """
+    text = repo.strip()
+    _, at, rest = text.partition("@")
+    if at and "://" not in text and ":" in rest:
+        # scp-like SSH remote: [user@]host:path
+        host, _, path = rest.partition(":")
+        name = path.strip("/") if host.lower() in _GITHUB_HOSTS else ""
+    else:
+        parts = urlsplit(text if "://" in text else "//" + text)
+        if parts.hostname in _GITHUB_HOSTS:
+            name = parts.path.strip("/")
+        else:
+            name = "" if "://" in text else text.strip("/")
+    if name.endswith(".git"):
+        name = name[:-4]
+    if not _REPO_NAME_RE.fullmatch(name):
+        raise ValueError(f"Not a GitHub repository: {repo!r} (expected owner/repo or a github.com URL)")
+    return name
+
+# Secret keys checked per integration by CONFIG; config.get already looks at the ARCHAI_* env var first
+_INTEGRATION_SECRETS = {
+    "github": ("github.token", "github_token"),
+    "jira": ("jira.token",),
+}
+
+@functools.cache
+def _integration_status() -> Dict[str, bool]:
+    """Resolves every integration's credentials in one pass; the SET-*-TOKEN commands clear it."""
+    return {name: any(config.get_secret(key) for key in keys) for name, keys in _INTEGRATION_SECRETS.items()}
+
+# Event loop shared by every console command instead of a fresh asyncio.run() per command
+_session_loop: Optional[asyncio.AbstractEventLoop] = None
+
+def run_async(coro):
+    """
+    Runs coro to completion on the console's session event loop. On Ctrl-C the task is
+    cancelled and drained before the interrupt propagates, so it cannot resume in the next command.
+    """
+    global _session_loop
+    if _session_loop is None or _session_loop.is_closed():
+        _session_loop = asyncio.new_event_loop()
+        asyncio.set_event_loop(_session_loop)
+    task = _session_loop.create_task(coro)
+    try:
+        return _session_loop.run_until_complete(task)
+    except KeyboardInterrupt:
+        task.cancel()
+        _session_loop.run_until_complete(asyncio.gather(task, return_exceptions=True))
+        raise
+
+# Single thread for blocking auditor calls; they share the cached auditor and graph state
+_worker_pool = ThreadPoolExecutor(max_workers=1, thread_name_prefix="archai-worker")
+
+def run_in_worker(func, *args, **kwargs):
+    """
+    Runs a blocking auditor call on the worker thread so Ctrl-C is noticed while it runs.
+    A thread cannot be stopped, so after Ctrl-C the console waits for the call to finish
+    before returning to the prompt; nothing keeps running against shared state.
+    """
+    future = _worker_pool.submit(func, *args, **kwargs)
+    try:
+        return _wait_for(future)
+    except KeyboardInterrupt:
+        print("\nInterrupted. Waiting for the current step to finish...")
+        while True:
+            try:
+                _wait_for(future, return_result=False)
+                break
+            except KeyboardInterrupt:
+                print("Still finishing the current step...")
+        raise
+
+def _wait_for(future, return_result=True):
+    # Short timed waits keep Ctrl-C deliverable on platforms where blocking lock waits are not interruptible
+    while not future.done():
+        futures_wait([future], timeout=0.25)
+    return future.result() if return_result else None
+
+def close_session_loop():
+    global _session_loop
+    if _session_loop is not None and not _session_loop.is_closed():
+        _session_loop.run_until_complete(_session_loop.shutdown_asyncgens())
+        _session_loop.close()
+    _session_loop = None
+
+# Parsed reports keyed by path, tagged with the file's (mtime_ns, size) when loaded or written
+_report_cache: Dict[str, Any] = {}
+
+def _file_signature(path: str):
+    st = os.stat(path)
+    return st.st_mtime_ns, st.st_size
+
+def _index_path(path: str) -> str:
+    return os.path.splitext(path)[0] + ".idx.json"
+
+def _serialize_report(report: Dict[str, Any]) -> Tuple[bytes, Dict[str, List[int]]]:
+    """
+    Serializes the report exactly as _dump_json would, dumping each task once and
+    recording the [start, end) byte range of every ticket id along the way.
+    """
+    tasks = report.get('tasks')
+    if not isinstance(tasks, list) or not tasks:
+        return _dump_json(report), {}
+    # Only a top-level key sits right after a newline and a two-space indent
+    marker = b'\n  "tasks": []'
+    head, sep, tail = _dump_json({**report, 'tasks': []}).partition(marker)
+    parts = [head, b'\n  "tasks": [']
+    offsets = {}
+    pos = len(head) + len(parts[1])
+    for i, t in enumerate(tasks):
+        # Top-level tasks sit two indent levels deep, so every continuation line gains 4 spaces
+        prefix = b"\n    " if i == 0 else b",\n    "
+        chunk = _dump_json(t).replace(b"\n", b"\n    ")
+        start = pos + len(prefix)
+        pos = start + len(chunk)
+        parts += (prefix, chunk)
+        tid = t.get('ticket_id') if isinstance(t, dict) else None
+        if tid is not None:
+            offsets.setdefault(tid, [start, pos])
+    parts += (b"\n  ]", tail)
+    return b"".join(parts), offsets
+
+def write_report(report: Dict[str, Any], path: str = "archai_report.json"):
+    """
+    Writes an audit report as indented JSON with a single write and keeps it in memory.
+    A ticket-id -> byte-range sidecar lets find_ticket read a single task later.
+    """
+    raw, offsets = _serialize_report(report)
+    Path(path).write_bytes(raw)
+    signature = _file_signature(path)
+    _report_cache[path] = (signature, report)
+    try:
+        Path(_index_path(path)).write_bytes(_dump_json({"signature": signature, "offsets": offsets}))
+    except (OSError, TypeError, ValueError) as e:
+        logger.debug(f"Skipping report index for {path}: {e}")
+
+def _read_indexed_ticket(ticket_id: str, path: str, signature) -> Any:
+    """Reads one task via the sidecar index; returns _EMPTY when the index is missing or stale."""
+    try:
+        index = _read_json(_index_path(path))
+    except (OSError, ValueError):
+        return _EMPTY
+    if tuple(index.get("signature") or ()) != signature:
+        return _EMPTY
+    span = index.get("offsets", {}).get(ticket_id)
+    if span is None:
+        return None
+    start, end = span
+    with open(path, "rb") as f:
+        f.seek(start)
+        raw = f.read(end - start)
+    return orjson.loads(raw) if orjson is not None else json.loads(raw)
+
+def load_report(path: str = "archai_report.json") -> Optional[Dict[str, Any]]:
+    """Returns the current report, re-parsing the file only if it changed on disk."""
+    try:
+        signature = _file_signature(path)
+    except FileNotFoundError:
+        return None
+    cached = _report_cache.get(path)
+    if cached and cached[0] == signature:
+        return cached[1]
+    report = _read_json(path)
+    _report_cache[path] = (signature, report)
+    return report
+
+def find_ticket(ticket_id: str, path: str = "archai_report.json") -> Optional[Dict[str, Any]]:
+    """
+    Returns one ticket from the report, or None if it has no such ticket.
+    Uncached reports are read through the sidecar index, or streamed with ijson
+    when installed, stopping at the match.
+    Raises FileNotFoundError when there is no report.
+    """
+    signature = _file_signature(path)
+    cached = _report_cache.get(path)
+    if cached and cached[0] == signature:
+        tasks = cached[1].get('tasks', [])
+    elif (ticket := _read_indexed_ticket(ticket_id, path, signature)) is not _EMPTY:
+        return ticket
+    elif ijson is not None:
+        with open(path, "rb", buffering=IO_BUFFER_SIZE) as f:
+            for t in ijson.items(f, "tasks.item", use_float=True):
+                if t.get('ticket_id') == ticket_id:
+                    return t
+        return None
+    else:
+        tasks = (load_report(path) or _EMPTY).get('tasks', [])
+    return next((t for t in tasks if t.get('ticket_id') == ticket_id), None)
+
+def render_forecast(report: Dict[str, Any]) -> str:
+    """Formats the identified work and sprint plan as one block of console text."""
+    tasks = report.get('tasks', [])
+    sprint_plan = report.get('sprintPlan', [])
+    out = [f"\n[IDENTIFIED WORK: {len(tasks)} items]\n"]
+    append = out.append
+    for t in tasks:
+        get = t.get
+        prio = get('priority', 'Medium')
+        tid = get('ticket_id', '???')
+        title = get('title', 'Unknown')
+        epic = get('epic', 'General')
+        
+        # Phase 1 Hardening: Range and Confidence
+        emin = get('effort_min', 1.0)
+        emax = get('effort_max', 4.0)
+        clevel = get('confidence_level', 'HIGH')
+        cscore = get('confidence_score', 1.0)
+        
+        # Highlight: Risky if flags present, level not HIGH, or score < 70%
+        is_risky = get('risk_flags') or clevel != 'HIGH' or cscore < 0.7
+        risk = " [RISKY]" if is_risky else ""
+        uncertainty = get('uncertainty_drivers')
+        drivers = f" | DRIVERS: {', '.join(uncertainty)}" if uncertainty else ""
+        
+        append(f" - [{tid}] {prio} | EPIC: {epic} | [{emin}-{emax}h] | {title}{risk} (Conf: {clevel} {cscore*100:.0f}%){drivers}\n")
+
+    append("\n[FEASIBILITY-DRIVEN SPRINT PLAN]\n")
+    for day in sprint_plan:
+        get = day.get
+        append(f"\n {get('day')} ({get('total_hours', 0):.1f}h) - STATUS: {get('feasibility', 'Unknown')}\n")
+        for t in get('tickets', []):
+            append(f"   * [{t.get('ticket_id')}] {t.get('title')}\n")
 
-async def run_archai_flow(path: str, context: Optional[str] = None, status: Optional[str] = None, goal: Optional[str] = None, verbose: bool = False, diagnostics: bool = False):
+    append(_FORECAST_FOOTER)
+    return "".join(out)
+
+async def run_archai_flow(path: str, context: Optional[str] = None, status: Optional[str] = None, goal: Optional[str] = None, verbose: bool = False, diagnostics: bool = False) -> Optional[Dict[str, Any]]:
     ConsoleUI.step_header("Context Acquisition", "Discovering and validating structural metadata")
     ConsoleUI.progress_bar("Path Navigation", 0.3)
     ConsoleUI.progress_bar("Discovery Agent", 0.5)
     
-    auditor = ArchitecturalAuditor()
+    auditor = _get_auditor()
     if verbose:
         logging.getLogger("ArchAI").setLevel(logging.INFO)
 
     if diagnostics:
+         # Read-only scan: no model calls, so the Ollama runtime is never started
          ConsoleUI.step_header("Site Survey (Diagnostics)", "Performing non-destructive structural scan")
          structure = auditor.scan_directory(path)
          print(structure)
@@ -77,497 +469,453 @@ async def run_archai_flow(path: str, context: Optional[str] = None, status: Opti
             project_status=status or "Stable"
         )
     
-    with open("archai_report.json", "w") as f:
-        json.dump(report, f, indent=4)
+    # Flush the report on a worker thread while the forecast renders
+    report_written = asyncio.create_task(asyncio.to_thread(write_report, report))
         
     ConsoleUI.step_header("Execution Forecast", f"Deterministic plan for {os.path.basename(path)}")
     
-    tasks = report.get('tasks', [])
-    sprint_plan = report.get('sprintPlan', [])
-    
-    print(f"\n[IDENTIFIED WORK: {len(tasks)} items]")
-    for t in tasks:
-        prio = t.get('priority', 'Medium')
-        tid = t.get('ticket_id', '???')
-        title = t.get('title', 'Unknown')
-        epic = t.get('epic', 'General')
-        
-        # Phase 1 Hardening: Range and Confidence
-        emin = t.get('effort_min', 1.0)
-        emax = t.get('effort_max', 4.0)
-        clevel = t.get('confidence_level', 'HIGH')
-        cscore = t.get('confidence_score', 1.0)
-        
-        # Highlight: Risky if flags present, level not HIGH, or score < 70%
-        is_risky = t.get('risk_flags') or clevel != 'HIGH' or cscore < 0.7
-        risk = " [RISKY]" if is_risky else ""
-        drivers = f" | DRIVERS: {', '.join(t.get('uncertainty_drivers', []))}" if t.get('uncertainty_drivers') else ""
-        
-        print(f" - [{tid}] {prio} | EPIC: {epic} | [{emin}-{emax}h] | {title}{risk} (Conf: {clevel} {cscore*100:.0f}%){drivers}")
+    sys.stdout.write(render_forecast(report))
+    await report_written
+    return report
 
-    print(f"\n[FEASIBILITY-DRIVEN SPRINT PLAN]")
-    for day in sprint_plan:
-        name = day.get('day')
-        hrs = day.get('total_hours', 0)
-        feas = day.get('feasibility', 'Unknown')
-        print(f"\n {name} ({hrs:.1f}h) - STATUS: {feas}")
-        for t in day.get('tickets', []):
-            print(f"   * [{t.get('ticket_id')}] {t.get('title')}")
-
-    print(f"\n{'='*70}")
-    print(f"SUGGESTED NEXT STEP: Use 'trace <ID>' to see evidence for specific tickets.")
-    print(f"ALTERNATELY: Use 'impact <path> <symbol>' to analyze risks of identified areas.")
-    print(f"Use 'explain' for a detailed summary.")
-    
+def prompt_feedback():
+    """Asks for sprint-plan feedback once the audit loop has finished."""
     useful = input("\nWas this sprint plan helpful? (y/n): ").lower().strip() == 'y'
     save_feedback(useful, [])
     print("Feedback saved. Thank you!")
 
 def print_help_table():
-    print(f"\n{'='*80}")
-    print(f"{'COMMAND':<25} | {'DESCRIPTION':<50}")
-    print(f"{'-'*25}-+-{'-'*50}")
-    print(f"{'PLAN':<25} | {'Generate actionable tasks (WDP-TG) for a goal'}")
-    print(f"{'IMPACT':<25} | {'Assess risk (CIRAS) for a file or symbol'}")
-    print(f"{'AUDIT':<25} | {'Full architectural audit and sprint planning'}")
-    print(f"{'GITHUB':<25} | {'Interact with GitHub (CONNECT, PRS, ANALYZE)'}")
-    print(f"{'TRACE':<25} | {'Show evidence trail for a specific ticket ID'}")
-    print(f"{'SIMULATE':<25} | {'Simulate success for a goal or specific ticket ID'}")
-    print(f"{'EXPLAIN':<25} | {'Justify decisions (PRIORITY, EFFORT, RISK, DEP)'}")
-    print(f"{'RELEASE-CONFIDENCE':<25} | {'Evaluate integrity of a release target'}")
-    print(f"{'G-REASON':<25} | {'Deterministic graph-based architectural reasoning'}")
-    print(f"{'SET-GITHUB-TOKEN':<25} | {'Securely register GitHub Personal Access Token'}")
-    print(f"{'SET-PM-TOKEN':<25} | {'Securely register Jira/Trello credentials'}")
-    print(f"{'CONFIG':<25} | {'View current configuration and integrations'}")
-    print(f"{'HELP':<25} | {'Show this command context table'}")
-    print(f"{'EXIT / PHIR-MILTY-HAIN':<25} | {'Terminate the ArchAI console session'}")
-    print(f"{'='*80}\n")
+    sys.stdout.write(_HELP_TABLE)
 
-def process_command(cmd_line: str):
-    try:
-        parts = shlex.split(cmd_line)
-    except ValueError:
-        print("Error: Invalid command syntax.")
+# --- CONFIGURATION COMMANDS ---
+def _cmd_set_github_token(args: List[str]):
+    if len(args) != 1:
+        print("Usage: SET-GITHUB-TOKEN <token>")
         return
-
-    if not parts:
+    os.environ["ARCHAI_GITHUB_TOKEN"] = args[0]
+    _get_github.cache_clear() # Next GITHUB command reconnects with the new token
+    _integration_status.cache_clear()
+    # In a real app we would save to keyring/config
+    print("✅ GitHub token updated in session environment.")
+
+def _cmd_set_pm_token(args: List[str]):
+    if len(args) < 2:
+        print("Usage: SET-PM-TOKEN <service> <token> [extra_id]")
         return
+    service = args[0].upper()
+    if service == "JIRA":
+         os.environ["ARCHAI_JIRA_TOKEN"] = args[1]
+         print("✅ Jira token updated in session environment.")
+    elif service == "TRELLO":
+         os.environ["ARCHAI_TRELLO_TOKEN"] = args[1]
+         if len(args) > 2: os.environ["ARCHAI_TRELLO_API_KEY"] = args[2]
+         print("✅ Trello credentials updated.")
+    else:
+        print("Unknown service. Use JIRA or TRELLO.")
+        return
+    _integration_status.cache_clear()
+
+def _cmd_config(args: List[str]):
+    connected = _integration_status()
+    gh_status = '✅ Connected' if connected["github"] else '❌ Missing'
+    pm_status = '✅ Connected' if connected["jira"] else '❌ Missing'
+    print("\n[CURRENT CONFIGURATION]")
+    print(f" User Identity: {config.get('user_id', 'Anonymous')}")
+    print(f" Model: {config.get('model', 'Unknown')}")
+    print(f" GitHub Integration: {gh_status}")
+    print(f" Jira Integration: {pm_status}")
+    print("")
+
+def _cmd_help(args: List[str]):
+    print_help_table()
 
-    command = parts[0].upper()
-    args = parts[1:]
-
-    # --- CONFIGURATION COMMANDS ---
-    if command == "SET-GITHUB-TOKEN":
-        if len(args) != 1:
-            print("Usage: SET-GITHUB-TOKEN <token>")
+# --- GITHUB COMMANDS ---
+def _cmd_github(args: List[str]):
+    if not args:
+        print("Usage: GITHUB <subcommand> [args]")
+        print("Subcommands: CONNECT <repo>, PRS <repo>, ANALYZE <repo> <pr#> <local_path>, AUDIT <repo>, VALIDATE-LOCAL <path> [base]")
+        return
+    
+    sub = args[0].upper()
+    repo_name = None
+    if sub in ("CONNECT", "PRS", "ANALYZE", "AUDIT") and len(args) > 1:
+        try:
+            repo_name = _repo_full_name(args[1])
+        except ValueError as e:
+            print(f"❌ {e}")
             return
-        os.environ["ARCHAI_GITHUB_TOKEN"] = args[0]
-        # In a real app we would save to keyring/config
-        print("✅ GitHub token updated in session environment.")
+    connector = _get_github()
+    
+    if sub == "CONNECT":
+        if len(args) < 2:
+            print("Usage: GITHUB CONNECT <owner/repo>")
+            return
+        print(f"📡 Connecting to {repo_name}...")
+        repo = connector.get_repo(repo_name)
+        if repo:
+            print(f"✅ Success: {repo.full_name}")
+            print(f"   Stars: {repo.stargazers_count} | Forks: {repo.forks_count}")
+            print(f"   Description: {repo.description}")
         return
 
-    if command == "SET-PM-TOKEN":
+    if sub == "PRS":
         if len(args) < 2:
-            print("Usage: SET-PM-TOKEN <service> <token> [extra_id]")
+            print("Usage: GITHUB PRS <owner/repo>")
             return
-        service = args[0].upper()
-        if service == "JIRA":
-             os.environ["ARCHAI_JIRA_TOKEN"] = args[1]
-             print("✅ Jira token updated in session environment.")
-        elif service == "TRELLO":
-             os.environ["ARCHAI_TRELLO_TOKEN"] = args[1]
-             if len(args) > 2: os.environ["ARCHAI_TRELLO_API_KEY"] = args[2]
-             print("✅ Trello credentials updated.")
+        print(f"🔍 Fetching open PRs for {repo_name}...")
+        with ConsoleUI.spinner("Retrieving PR metadata from GitHub API"):
+            prs = connector.fetch_open_prs(repo_name)
+        if not prs:
+            print("No open PRs found.")
         else:
-            print("Unknown service. Use JIRA or TRELLO.")
+            for pr in prs:
+                print(f" #{pr.number} | {pr.title} (by {pr.author})")
         return
 
-    if command == "CONFIG":
-        gh_status = '✅ Connected' if os.getenv('ARCHAI_GITHUB_TOKEN') or config.get_secret('github.token') or config.get_secret('github_token') else '❌ Missing'
-        pm_status = '✅ Connected' if os.getenv('ARCHAI_JIRA_TOKEN') or config.get_secret('jira.token') else '❌ Missing'
-        print("\n[CURRENT CONFIGURATION]")
-        print(f" User Identity: {config.get('user_id', 'Anonymous')}")
-        print(f" Model: {config.get('model', 'Unknown')}")
-        print(f" GitHub Integration: {gh_status}")
-        print(f" Jira Integration: {pm_status}")
-        print("")
-        return
-
-    if command == "HELP":
-        print_help_table()
+    if sub == "ANALYZE":
+        if len(args) < 4:
+            print("Usage: GITHUB ANALYZE <owner/repo> <pr_number> <local_path> [--publish]")
+            return
+        pr_num = int(args[2])
+        local_path = args[3]
+        publish = "--publish" in args
+        
+        print(f"🛡️ Analyzing PR #{pr_num} for {repo_name}...")
+        _require_runtime()
+        connector.auditor = _get_auditor()
+        with ConsoleUI.spinner("Adjudicating PR architectural impact"):
+            report = connector.analyze_pr(repo_name, pr_num, local_path)
+        if report:
+            print(f"\n[ANALYSIS REPORT PR #{pr_num}]")
+            c_level = report.impact_assessment.confidence_level
+            c_score = report.impact_assessment.confidence_score
+            print(f" Impact: {report.impact_assessment.risk_level} (Score: {report.impact_assessment.risk_score:.1f})")
+            print(f" Confidence: {c_level} ({c_score*100:.1f}%)")
+            if report.impact_assessment.uncertainty_drivers:
+                print(f" Drivers: {', '.join(report.impact_assessment.uncertainty_drivers)}")
+            print(f" Rationale: {report.impact_assessment.rationale}")
+            
+            if publish:
+                print(f"🚀 Publishing comment to PR #{pr_num}...")
+                connector.post_pr_comment(repo_name, pr_num, report)
+                print("✅ Comment published.")
+            else:
+                print("ℹ️ Quiet Mode: Use --publish to post this as a PR comment.")
         return
 
-    # --- GITHUB COMMANDS ---
-    if command == "GITHUB":
-        if not args:
-            print("Usage: GITHUB <subcommand> [args]")
-            print("Subcommands: CONNECT <repo>, PRS <repo>, ANALYZE <repo> <pr#> <local_path>, AUDIT <repo>, VALIDATE-LOCAL <path> [base]")
+    if sub == "AUDIT":
+        if len(args) < 2:
+            print("Usage: GITHUB AUDIT <owner/repo> [--goal 'goal text']")
             return
         
-        sub = args[0].upper()
-        connector = GitHubConnector()
+        goal = None
+        if "--goal" in args:
+            goal_idx = args.index("--goal")
+            if len(args) > goal_idx + 1:
+                goal = args[goal_idx + 1]
         
-        if sub == "CONNECT":
-            if len(args) < 2:
-                print("Usage: GITHUB CONNECT <owner/repo>")
-                return
-            repo_name = args[1].replace("https://github.com/", "")
-            print(f"📡 Connecting to {repo_name}...")
-            repo = connector.get_repo(repo_name)
-            if repo:
-                print(f"✅ Success: {repo.full_name}")
-                print(f"   Stars: {repo.stargazers_count} | Forks: {repo.forks_count}")
-                print(f"   Description: {repo.description}")
-            return
-
-        if sub == "PRS":
-            if len(args) < 2:
-                print("Usage: GITHUB PRS <owner/repo>")
-                return
-            repo_name = args[1].replace("https://github.com/", "")
-            print(f"🔍 Fetching open PRs for {repo_name}...")
-            with ConsoleUI.spinner("Retrieving PR metadata from GitHub API"):
-                prs = connector.fetch_open_prs(repo_name)
-            if not prs:
-                print("No open PRs found.")
-            else:
-                for pr in prs:
-                    print(f" #{pr.number} | {pr.title} (by {pr.author})")
-            return
-
-        if sub == "ANALYZE":
-            if len(args) < 4:
-                print("Usage: GITHUB ANALYZE <owner/repo> <pr_number> <local_path> [--publish]")
-                return
-            repo_name = args[1].replace("https://github.com/", "")
-            pr_num = int(args[2])
-            local_path = args[3]
-            publish = "--publish" in args
+        print(f"🔍 Starting Deep Audit on remote repo: {repo_name}")
+        if goal:
+            print(f"🎯 Target Goal: {goal}")
+        _require_runtime()
+        connector.auditor = _get_auditor()
+        # We need to run inside a dummy flow for progress headers etc.
+        # But for simplicity, we directly call the auditor through the connector
+        with ConsoleUI.spinner("Cloning and auditing remote infrastructure"):
+            report = run_async(connector.audit_repo(repo_name, context=goal))
+        if report:
+            # Save to locally for TRACE and future commands
+            write_report(report)
             
-            print(f"🛡️ Analyzing PR #{pr_num} for {repo_name}...")
-            with ConsoleUI.spinner("Adjudicating PR architectural impact"):
-                report = connector.analyze_pr(repo_name, pr_num, local_path)
-            if report:
-                print(f"\n[ANALYSIS REPORT PR #{pr_num}]")
-                c_level = report.impact_assessment.confidence_level
-                c_score = report.impact_assessment.confidence_score
-                print(f" Impact: {report.impact_assessment.risk_level} (Score: {report.impact_assessment.risk_score:.1f})")
-                print(f" Confidence: {c_level} ({c_score*100:.1f}%)")
-                if report.impact_assessment.uncertainty_drivers:
-                    print(f" Drivers: {', '.join(report.impact_assessment.uncertainty_drivers)}")
-                print(f" Rationale: {report.impact_assessment.rationale}")
-                
-                if publish:
-                    print(f"🚀 Publishing comment to PR #{pr_num}...")
-                    connector.post_pr_comment(repo_name, pr_num, report)
-                    print("✅ Comment published.")
-                else:
-                    print("ℹ️ Quiet Mode: Use --publish to post this as a PR comment.")
-            return
+            # Print results (reusing some logic from run_archai_flow)
+            tasks = report.get('tasks', [])
+            lines = [f"\n[IDENTIFIED WORK: {len(tasks)} items]"]
+            lines.extend(
+                f" - [{t.get('ticket_id', '???')}] {t.get('priority', 'Medium')} | {t.get('title', 'Unknown')}"
+                for t in tasks
+            )
+            lines.append("\nAudit complete. Use 'TRACE <ID>' for evidence.\n")
+            sys.stdout.write("\n".join(lines))
+        return
 
-        if sub == "AUDIT":
-            if len(args) < 2:
-                print("Usage: GITHUB AUDIT <owner/repo> [--goal 'goal text']")
-                return
-            repo_name = args[1].replace("https://github.com/", "")
-            
-            goal = None
-            if "--goal" in args:
-                goal_idx = args.index("--goal")
-                if len(args) > goal_idx + 1:
-                    goal = args[goal_idx + 1]
-            
-            print(f"🔍 Starting Deep Audit on remote repo: {repo_name}")
-            if goal:
-                print(f"🎯 Target Goal: {goal}")
-            initialize_ollama()
-            # We need to run inside a dummy flow for progress headers etc.
-            # But for simplicity, we directly call the auditor through the connector
-            with ConsoleUI.spinner("Cloning and auditing remote infrastructure"):
-                report = asyncio.run(connector.audit_repo(repo_name, context=goal))
-            if report:
-                # Save to locally for TRACE and future commands
-                with open("archai_report.json", "w") as f:
-                    json.dump(report, f, indent=4)
-                
-                # Print results (reusing some logic from run_archai_flow)
-                tasks = report.get('tasks', [])
-                print(f"\n[IDENTIFIED WORK: {len(tasks)} items]")
-                for t in tasks:
-                    prio = t.get('priority', 'Medium')
-                    tid = t.get('ticket_id', '???')
-                    title = t.get('title', 'Unknown')
-                    print(f" - [{tid}] {prio} | {title}")
-                print(f"\nAudit complete. Use 'TRACE <ID>' for evidence.")
+    if sub == "VALIDATE-LOCAL":
+        if len(args) < 2:
+            print("Usage: GITHUB VALIDATE-LOCAL <path> [base_branch]")
             return
+        path = args[1]
+        base = args[2] if len(args) > 2 else "main"
+        print(f"🔍 Starting Quiet Validation for {path} vs {base}...")
+        _require_runtime()
+        connector.auditor = _get_auditor()
+        with ConsoleUI.spinner("Evaluating local diff against base branch safety thresholds"):
+            reports = connector.validate_local_diff(path, base)
+        if not reports:
+            print("No changes found or analysis failed.")
+        else:
+            print(f"\n[VALIDATION SUMMARY: {len(reports)} files]")
+            for r in reports:
+                status_color = _RISK_COLOR.get(r.risk_level, "🟢")
+                print(f" - {r.target} | RISK: {status_color} {r.risk_level} | CONF: {r.confidence_level} ({r.confidence_score*100:.0f}%)")
+                if r.uncertainty_drivers:
+                    print(f"   ! Drivers: {', '.join(r.uncertainty_drivers)}")
+        return
 
-        if sub == "VALIDATE-LOCAL":
-            if len(args) < 2:
-                print("Usage: GITHUB VALIDATE-LOCAL <path> [base_branch]")
-                return
-            path = args[1]
-            base = args[2] if len(args) > 2 else "main"
-            print(f"🔍 Starting Quiet Validation for {path} vs {base}...")
-            initialize_ollama()
-            with ConsoleUI.spinner("Evaluating local diff against base branch safety thresholds"):
-                reports = connector.validate_local_diff(path, base)
-            if not reports:
-                print("No changes found or analysis failed.")
-            else:
-                print(f"\n[VALIDATION SUMMARY: {len(reports)} files]")
-                for r in reports:
-                    status_color = "🔴" if r.risk_level == "HIGH" else "🟡" if r.risk_level == "MEDIUM" else "🟢"
-                    print(f" - {r.target} | RISK: {status_color} {r.risk_level} | CONF: {r.confidence_level} ({r.confidence_score*100:.0f}%)")
-                    if r.uncertainty_drivers:
-                        print(f"   ! Drivers: {', '.join(r.uncertainty_drivers)}")
-            return
+    print(f"Unknown GITHUB subcommand: {sub}")
 
-        print(f"Unknown GITHUB subcommand: {sub}")
+# --- ACTION COMMANDS (Mapped to existing logic) ---
+def _cmd_audit(args: List[str]):
+    try:
+        parsed, unknown = _AUDIT_PARSER.parse_known_args(args)
+        parsed.path = parsed.path or os.getcwd()
+        print(f"🔍 Starting Audit on: {parsed.path}")
+        if parsed.goal:
+            print(f"🎯 Target Goal: {parsed.goal}")
+        if not parsed.diagnostics:
+            _require_runtime()
+        report = run_async(run_archai_flow(parsed.path, context=parsed.goal, verbose=parsed.verbose, diagnostics=parsed.diagnostics))
+        if report is not None:
+            prompt_feedback()
+    except ValueError as e:
+        print(f"❌ Audit Usage Error: {e}")
+        print("Usage: AUDIT <path> [--goal 'goal'] [--verbose] [--diagnostics]")
+    except Exception as e:
+        print(f"❌ Audit failed: {e}")
+
+def _cmd_impact(args: List[str]):
+    if len(args) < 2:
+        print("Usage: IMPACT <path> <target_symbol> [--verbose]")
         return
-
-    # --- ACTION COMMANDS (Mapped to existing logic) ---
+    path = args[0]
+    target = args[1]
+    verbose = "--verbose" in args
     
-    # AUDIT
-    if command == "AUDIT":
-        parser = SafeArgumentParser(prog="AUDIT", add_help=False)
-        parser.add_argument("path", nargs="?", default=os.getcwd())
-        parser.add_argument("--goal", type=str, help="Specific architectural goal for the audit")
-        parser.add_argument("--verbose", action="store_true")
-        parser.add_argument("--diagnostics", action="store_true")
-        try:
-            parsed, unknown = parser.parse_known_args(args)
-            print(f"🔍 Starting Audit on: {parsed.path}")
-            if parsed.goal:
-                print(f"🎯 Target Goal: {parsed.goal}")
-            initialize_ollama()
-            asyncio.run(run_archai_flow(parsed.path, context=parsed.goal, verbose=parsed.verbose, diagnostics=parsed.diagnostics))
-        except ValueError as e:
-            print(f"❌ Audit Usage Error: {e}")
-            print("Usage: AUDIT <path> [--goal 'goal'] [--verbose] [--diagnostics]")
-        except Exception as e:
-            print(f"❌ Audit failed: {e}")
+    try:
+        if verbose: logging.getLogger("ArchAI").setLevel(logging.INFO)
+        _require_runtime()
+        auditor = _get_auditor()
+        print(f"🛡️ Assessing Impact for: {target} in {path}")
+        with ConsoleUI.spinner("Mapping dependency fan-out and risk propagation"):
+            assessment = run_in_worker(auditor.ImpactAnalyzer, path, target)
+        
+        status_color = _RISK_COLOR.get(assessment.risk_level, "🟢")
+        print(f"\n RISK LEVEL: {status_color} {assessment.risk_level} ({assessment.risk_score:.1f}/100)")
+        conf_color = _CONF_COLOR.get(assessment.confidence_level, "🔴")
+        print(f" CONFIDENCE: {conf_color} {assessment.confidence_level} ({assessment.confidence_score*100:.1f}%)")
+        
+        if assessment.uncertainty_drivers:
+            print(f" UNCERTAINTY DRIVERS: {', '.join(assessment.uncertainty_drivers)}")
+        
+        if assessment.rationale:
+            print(f" RATIONALE: {assessment.rationale}")
+        
+        if assessment.affected_components:
+            out = ["\n AFFECTED EDGES:\n"]
+            out.extend(
+                f"   -> {comp.get('name')} [Depth: {comp.get('depth')}] in {comp.get('file')} (Edge: {comp.get('dependency_edge', 'Direct')})\n"
+                for comp in assessment.affected_components
+            )
+            sys.stdout.write("".join(out))
+    except Exception as e:
+        print(f"❌ Impact analysis failed: {e}")
+
+def _cmd_plan(args: List[str]):
+    try:
+        parsed, unknown = _PLAN_PARSER.parse_known_args(args)
+        from ai_architect.data.models import SprintPlanConfig
+        _require_runtime()
+        auditor = _get_auditor()
+        conf = SprintPlanConfig(team_size=parsed.team_size, days=parsed.days, velocity_factor=parsed.velocity)
+        
+        print(f"🚀 Generating Plan for: {parsed.goal}")
+        print(f"⚙️ Capacity: {parsed.team_size} devs | {parsed.days} days | {parsed.velocity*100:.0f}% velocity")
+        with ConsoleUI.spinner("Analyzing codebase and decomposing work"):
+            plan = run_in_worker(auditor.WDPPlanner, parsed.path, parsed.goal, sprint_config=conf)
+        
+        out = ["\n[GENERATED PLAN]\n"]
+        append = out.append
+        for epic in plan.epics:
+            tickets = epic.get('tickets', [{}])
+            append(f" Epic: {epic.get('name')} (Conf: {tickets[0].get('confidence_level', 'N/A')})\n")
+            for t in epic.get('tickets', []):
+                get = t.get
+                append(f"  - [{get('ticket_id')}] {get('title')} [{get('effort_min', 0)}-{get('effort_max', 0)}h]\n")
+        sys.stdout.write("".join(out))
+    except ValueError as e:
+        print(f"❌ Plan Usage Error: {e}")
+        print("Usage: PLAN <path> <goal> [--team-size N] [--days N] [--velocity F]")
+    except Exception as e:
+        print(f"❌ Planning failed: {e}")
+
+def _cmd_trace(args: List[str]):
+    if not args:
+        print("Usage: TRACE <ticket_id>")
         return
-
-    # IMPACT
-    if command == "IMPACT":
-        if len(args) < 2:
-            print("Usage: IMPACT <path> <target_symbol> [--verbose]")
-            return
-        path = args[0]
-        target = args[1]
-        verbose = "--verbose" in args
+    ticket_id = args[0]
+    try:
+        ticket = find_ticket(ticket_id)
+    except FileNotFoundError:
+         print("No active report found. Run AUDIT first.")
+         return
+    if ticket:
+         ev = ticket.get('evidence') or _EMPTY
+         print(f"\n[TRACE EVIDENCE FOR {ticket_id}]")
+         print(f" Responsible Agent: {ev.get('responsible_agent', 'Unassigned')}")
+         print(f" File Target: {ev.get('file_path', 'N/A')}")
+         if ev.get('line_range'): print(f" Line Range: {ev.get('line_range')}")
+         print(f" Confidence: {ticket.get('confidence_level', 'Unknown')} ({ticket.get('confidence_score', 0)*100:.1f}%)")
+         if ticket.get('uncertainty_drivers'):
+             print(f" Uncertainty Drivers: {', '.join(ticket.get('uncertainty_drivers'))}")
+         print(f" Logic Trace: {ticket.get('description')}")
+    else:
+        print(f"Ticket {ticket_id} not found.")
+
+def _cmd_explain(args: List[str]):
+    if len(args) < 2:
+        print("Usage: EXPLAIN <intent> <target> [--json]")
+        print("Intents: PRIORITY, EFFORT, RISK, DEPENDENCIES")
+        return
+    intent = args[0].upper()
+    target = args[1]
+    json_mode = "--json" in args
+    
+    # Standard artifacts
+    artifacts = ["archai_report.json", "risk-map.json", "dependency-graph.json", "historical-metrics.json"]
+    
+    try:
+        _require_runtime()
+        auditor = _get_auditor()
+        print(f"🧐 Explaining {intent} for {target}...")
+        with ConsoleUI.spinner("Generating deterministic reasoning receipt"):
+            result = run_in_worker(auditor.ExplainabilityAgent, intent, target, artifacts, json_mode=json_mode)
         
-        try:
-            if verbose: logging.getLogger("ArchAI").setLevel(logging.INFO)
-            initialize_ollama()
-            auditor = ArchitecturalAuditor()
-            print(f"🛡️ Assessing Impact for: {target} in {path}")
-            with ConsoleUI.spinner("Mapping dependency fan-out and risk propagation"):
-                assessment = auditor.ImpactAnalyzer(path, target)
-            
-            status_color = "🔴" if assessment.risk_level == "HIGH" else "🟡" if assessment.risk_level == "MEDIUM" else "🟢"
-            print(f"\n RISK LEVEL: {status_color} {assessment.risk_level} ({assessment.risk_score:.1f}/100)")
-            conf_color = "🟢" if assessment.confidence_level == "HIGH" else "🟡" if assessment.confidence_level == "MEDIUM" else "🔴"
-            print(f" CONFIDENCE: {conf_color} {assessment.confidence_level} ({assessment.confidence_score*100:.1f}%)")
+        if json_mode:
+            print(result.model_dump_json(indent=2))
+        else:
+            print("\n" + _RULE)
+            print(f" ARCHAI EXPLAINABILITY REPORT: {target} [{intent}]")
+            print(_RULE)
+            print(result.raw_markdown)
+            print(_RULE)
+    except Exception as e:
+        print(f"❌ Explanation failed: {e}")
+
+def _cmd_g_reason(args: List[str]):
+    if len(args) < 2:
+        print("Usage: G-REASON <path> <query>")
+        return
+    path = args[0]
+    query = args[1]
+    try:
+        _require_runtime()
+        auditor = _get_auditor()
+        print(f"🕸️ Reasoning over Deterministic Graph at {path}...")
+        with ConsoleUI.spinner("Traversing multi-layer architectural graph"):
+            result = run_in_worker(auditor.DeterministicGraphEngine, path, query)
+        print("\n" + _RULE)
+        print(f" ARCHAI GRAPH-CORE JUDGMENT")
+        print(_RULE)
+        print(result)
+        print(_RULE)
+    except Exception as e:
+        print(f"❌ Graph reasoning failed: {e}")
+
+def _cmd_simulate(args: List[str], command: str = "SIMULATE"):
+    try:
+        parsed, unknown = _SIMULATE_PARSERS[command].parse_known_args(args)
+        if not parsed.target:
+            raise ValueError("No target specified.")
             
-            if assessment.uncertainty_drivers:
-                print(f" UNCERTAINTY DRIVERS: {', '.join(assessment.uncertainty_drivers)}")
+        from ai_architect.data.models import SprintPlanConfig, WDPOutput, AuditTicket
+        _require_runtime()
+        auditor = _get_auditor()
+        conf = SprintPlanConfig(team_size=parsed.team_size, days=parsed.days, velocity_factor=parsed.velocity)
+        
+        # 1. Logic for SIMULATE <ticket_id>
+        if len(parsed.target) == 1:
+            ticket_id = parsed.target[0]
+            try:
+                ticket_data = find_ticket(ticket_id)
+            except FileNotFoundError:
+                print("No active report found. Run AUDIT first.")
+                return
             
-            if assessment.rationale:
-                print(f" RATIONALE: {assessment.rationale}")
+            if not ticket_data:
+                print(f"Ticket {ticket_id} not found in current report.")
+                return
             
-            if assessment.affected_components:
-                print("\n AFFECTED EDGES:")
-                for comp in assessment.affected_components:
-                    print(f"   -> {comp.get('name')} [Depth: {comp.get('depth')}] in {comp.get('file')} (Edge: {comp.get('dependency_edge', 'Direct')})")
-        except Exception as e:
-            print(f"❌ Impact analysis failed: {e}")
-        return
-
-    # PLAN
-    if command == "PLAN":
-        parser = SafeArgumentParser(prog="PLAN", add_help=False)
-        parser.add_argument("path", help="Project path")
-        parser.add_argument("goal", help="Engineering goal")
-        parser.add_argument("--team-size", type=int, default=3)
-        parser.add_argument("--days", type=int, default=5)
-        parser.add_argument("--velocity", type=float, default=0.8)
-        
-        try:
-            parsed, unknown = parser.parse_known_args(args)
-            initialize_ollama()
-            auditor = ArchitecturalAuditor()
-            conf = SprintPlanConfig(team_size=parsed.team_size, days=parsed.days, velocity_factor=parsed.velocity)
+            # Map camelCase from JSON back to snake_case for Pydantic if necessary
+            pd_data = ticket_data.copy()
+            if "effortHours" in pd_data: pd_data["effort_hours"] = pd_data.pop("effortHours")
+            if "tags" in pd_data: pd_data["labels"] = pd_data.pop("tags")
             
-            print(f"🚀 Generating Plan for: {parsed.goal}")
+            ticket = AuditTicket(**pd_data)
+            plan = WDPOutput(
+                epics=[{"name": "Target Ticket", "description": "Simulation for specific ticket", "tickets": [ticket]}],
+                sprint_feasibility={"status": "SPECIFIC-TARGET", "rationale": "Single ticket simulation", "bottlenecks": []},
+                overall_confidence=1.0
+            )
+            path = os.getcwd() 
+            goal = ticket.title
+            print(f"🎲 Simulating Ticket: [{ticket_id}] {goal}")
             print(f"⚙️ Capacity: {parsed.team_size} devs | {parsed.days} days | {parsed.velocity*100:.0f}% velocity")
-            with ConsoleUI.spinner("Analyzing codebase and decomposing work"):
-                plan = auditor.WDPPlanner(parsed.path, parsed.goal, sprint_config=conf)
-            
-            print(f"\n[GENERATED PLAN]")
-            for epic in plan.epics:
-                print(f" Epic: {epic.get('name')} (Conf: {epic.get('tickets', [{}])[0].get('confidence_level', 'N/A')})")
-                for t in epic.get('tickets', []):
-                    emin = t.get('effort_min', 0)
-                    emax = t.get('effort_max', 0)
-                    print(f"  - [{t.get('ticket_id')}] {t.get('title')} [{emin}-{emax}h]")
-        except ValueError as e:
-            print(f"❌ Plan Usage Error: {e}")
-            print("Usage: PLAN <path> <goal> [--team-size N] [--days N] [--velocity F]")
-        except Exception as e:
-            print(f"❌ Planning failed: {e}")
-        return
+            with ConsoleUI.spinner("Predicting execution risk and release probability"):
+                src = run_in_worker(auditor.SRCEngine, path, goal, wdp_plan=plan, sprint_config=conf)
 
-    # TRACE
-    if command == "TRACE":
-        if not args:
-            print("Usage: TRACE <ticket_id>")
-            return
-        ticket_id = args[0]
-        if not os.path.exists("archai_report.json"):
-             print("No active report found. Run AUDIT first.")
-             return
-        with open("archai_report.json", "r") as f:
-            report = json.load(f)
-        ticket = next((t for t in report.get('tasks', []) if t.get('ticket_id') == ticket_id), None)
-        if ticket:
-             ev = ticket.get('evidence', {})
-             print(f"\n[TRACE EVIDENCE FOR {ticket_id}]")
-             print(f" Responsible Agent: {ev.get('responsible_agent', 'Unassigned')}")
-             print(f" File Target: {ev.get('file_path', 'N/A')}")
-             if ev.get('line_range'): print(f" Line Range: {ev.get('line_range')}")
-             print(f" Confidence: {ticket.get('confidence_level', 'Unknown')} ({ticket.get('confidence_score', 0)*100:.1f}%)")
-             if ticket.get('uncertainty_drivers'):
-                 print(f" Uncertainty Drivers: {', '.join(ticket.get('uncertainty_drivers'))}")
-             print(f" Logic Trace: {ticket.get('description')}")
         else:
-            print(f"Ticket {ticket_id} not found.")
-        return
-
-    # EXPLAIN
-    if command == "EXPLAIN":
-        if len(args) < 2:
-            print("Usage: EXPLAIN <intent> <target> [--json]")
-            print("Intents: PRIORITY, EFFORT, RISK, DEPENDENCIES")
-            return
-        intent = args[0].upper()
-        target = args[1]
-        json_mode = "--json" in args
-        
-        # Standard artifacts
-        artifacts = ["archai_report.json", "risk-map.json", "dependency-graph.json", "historical-metrics.json"]
+            path = parsed.target[0]
+            goal = parsed.target[1]
+            print(f"🎲 Simulating Execution: {goal}")
+            print(f"⚙️ Capacity: {parsed.team_size} devs | {parsed.days} days | {parsed.velocity*100:.0f}% velocity")
+            with ConsoleUI.spinner("Running Monte Carlo simulation over dependency graph"):
+                plan = run_in_worker(auditor.WDPPlanner, path, goal, sprint_config=conf)
+                src = run_in_worker(auditor.SRCEngine, path, goal, wdp_plan=plan, sprint_config=conf)
         
-        try:
-            initialize_ollama()
-            auditor = ArchitecturalAuditor()
-            print(f"🧐 Explaining {intent} for {target}...")
-            with ConsoleUI.spinner("Generating deterministic reasoning receipt"):
-                result = auditor.ExplainabilityAgent(intent, target, artifacts, json_mode=json_mode)
-            
-            if json_mode:
-                print(result.model_dump_json(indent=2))
-            else:
-                print("\n" + "="*80)
-                print(f" ARCHAI EXPLAINABILITY REPORT: {target} [{intent}]")
-                print("="*80)
-                print(result.raw_markdown)
-                print("="*80)
-        except Exception as e:
-            print(f"❌ Explanation failed: {e}")
-        return
+        print(f"\n CONFIDENCE: {src.confidence_score*100:.1f}% ({src.status})")
+        print(f" Rationale: {src.confidence_rationale}")
+    except ValueError as e:
+        print(f"❌ {command} Usage Error: {e}")
+        print(f"Usage: {command} <path> <goal> [--team-size N]  OR  {command} <ticket_id>")
+    except Exception as e:
+        print(f"❌ Simulation failed: {e}")
+
+# Console command name -> handler; SIMULATE and RELEASE-CONFIDENCE share one handler
+_COMMANDS = {
+    "SET-GITHUB-TOKEN": _cmd_set_github_token,
+    "SET-PM-TOKEN": _cmd_set_pm_token,
+    "CONFIG": _cmd_config,
+    "HELP": _cmd_help,
+    "GITHUB": _cmd_github,
+    "AUDIT": _cmd_audit,
+    "IMPACT": _cmd_impact,
+    "PLAN": _cmd_plan,
+    "TRACE": _cmd_trace,
+    "EXPLAIN": _cmd_explain,
+    "G-REASON": _cmd_g_reason,
+    "SIMULATE": _cmd_simulate,
+    "RELEASE-CONFIDENCE": functools.partial(_cmd_simulate, command="RELEASE-CONFIDENCE"),
+}
 
-    # G-REASON
-    if command == "G-REASON":
-        if len(args) < 2:
-            print("Usage: G-REASON <path> <query>")
-            return
-        path = args[0]
-        query = args[1]
+def process_command(cmd_line: str):
+    if _SHELL_QUOTING.isdisjoint(cmd_line):
+        parts = cmd_line.split()
+    else:
         try:
-            initialize_ollama()
-            auditor = ArchitecturalAuditor()
-            print(f"🕸️ Reasoning over Deterministic Graph at {path}...")
-            with ConsoleUI.spinner("Traversing multi-layer architectural graph"):
-                result = auditor.DeterministicGraphEngine(path, query)
-            print("\n" + "="*80)
-            print(f" ARCHAI GRAPH-CORE JUDGMENT")
-            print("="*80)
-            print(result)
-            print("="*80)
-        except Exception as e:
-            print(f"❌ Graph reasoning failed: {e}")
-        return
-
-    # SIMULATE / RELEASE-CONFIDENCE (Shared logic)
-    if command in ["SIMULATE", "RELEASE-CONFIDENCE"]:
-         parser = SafeArgumentParser(prog=command, add_help=False)
-         parser.add_argument("target", nargs="*", help="Path and Goal OR Ticket ID")
-         parser.add_argument("--team-size", type=int, default=3)
-         parser.add_argument("--days", type=int, default=5)
-         parser.add_argument("--velocity", type=float, default=0.8)
-         
-         try:
-            parsed, unknown = parser.parse_known_args(args)
-            if not parsed.target:
-                raise ValueError("No target specified.")
-                
-            initialize_ollama()
-            auditor = ArchitecturalAuditor()
-            conf = SprintPlanConfig(team_size=parsed.team_size, days=parsed.days, velocity_factor=parsed.velocity)
-            
-            # 1. Logic for SIMULATE <ticket_id>
-            if len(parsed.target) == 1:
-                ticket_id = parsed.target[0]
-                if not os.path.exists("archai_report.json"):
-                    print("No active report found. Run AUDIT first.")
-                    return
-                with open("archai_report.json", "r") as f:
-                    report = json.load(f)
-                
-                # Locate ticket in the report
-                ticket_data = next((t for t in report.get('tasks', []) if t.get('ticket_id') == ticket_id), None)
-                if not ticket_data:
-                    print(f"Ticket {ticket_id} not found in current report.")
-                    return
-                
-                # Map camelCase from JSON back to snake_case for Pydantic if necessary
-                pd_data = ticket_data.copy()
-                if "effortHours" in pd_data: pd_data["effort_hours"] = pd_data.pop("effortHours")
-                if "tags" in pd_data: pd_data["labels"] = pd_data.pop("tags")
-                
-                ticket = AuditTicket(**pd_data)
-                plan = WDPOutput(
-                    epics=[{"name": "Target Ticket", "description": "Simulation for specific ticket", "tickets": [ticket]}],
-                    sprint_feasibility={"status": "SPECIFIC-TARGET", "rationale": "Single ticket simulation", "bottlenecks": []},
-                    overall_confidence=1.0
-                )
-                path = os.getcwd() 
-                goal = ticket.title
-                print(f"🎲 Simulating Ticket: [{ticket_id}] {goal}")
-                print(f"⚙️ Capacity: {parsed.team_size} devs | {parsed.days} days | {parsed.velocity*100:.0f}% velocity")
-                with ConsoleUI.spinner("Predicting execution risk and release probability"):
-                    src = auditor.SRCEngine(path, goal, wdp_plan=plan, sprint_config=conf)
+            parts = shlex.split(cmd_line)
+        except ValueError:
+            print("Error: Invalid command syntax.")
+            return
 
-            else:
-                path = parsed.target[0]
-                goal = parsed.target[1]
-                print(f"🎲 Simulating Execution: {goal}")
-                print(f"⚙️ Capacity: {parsed.team_size} devs | {parsed.days} days | {parsed.velocity*100:.0f}% velocity")
-                with ConsoleUI.spinner("Running Monte Carlo simulation over dependency graph"):
-                    plan = auditor.WDPPlanner(path, goal, sprint_config=conf)
-                    src = auditor.SRCEngine(path, goal, wdp_plan=plan, sprint_config=conf)
-            
-            print(f"\n CONFIDENCE: {src.confidence_score*100:.1f}% ({src.status})")
-            print(f" Rationale: {src.confidence_rationale}")
-         except ValueError as e:
-             print(f"❌ {command} Usage Error: {e}")
-             print(f"Usage: {command} <path> <goal> [--team-size N]  OR  {command} <ticket_id>")
-         except Exception as e:
-             print(f"❌ Simulation failed: {e}")
-         return
+    if not parts:
+        return
 
+    command = parts[0].upper()
+    args = parts[1:]
 
-    print(f"Unknown command: {command}. Type HELP for valid commands.")
+    handler = _COMMANDS.get(command)
+    if handler is None:
+        print(f"Unknown command: {command}. Type HELP for valid commands.")
+        return
+    handler(args)
 
 def run_interactive_console():
     # 1. Identity Banner
@@ -591,10 +939,10 @@ def run_interactive_console():
     mode = "AUTHENTICATED" if auth_token else "TEST-MODE"
     core_hash = get_graph_core_hash()
     
-    print(f"{'='*80}")
+    print(_RULE)
     print(f" IDENTITY: {user_id} | MODE: {mode} | VERSION: {ARCHAI_VERSION}")
     print(f" INTEGRITY: {core_hash} | LICENSE: {lic_status}")
-    print(f"{'='*80}\n")
+    print(_RULE + "\n")
 
     # 3. Command Context
     print_help_table()
@@ -608,6 +956,7 @@ def run_interactive_console():
             
             if user_input.lower() in ["exit", "quit", "phir-milty-hain", "phir milty hain"]:
                 print("🛑 Session Terminated. Phir milty hain!")
+                close_session_loop()
                 break
                 
             process_command(user_input)
@@ -653,10 +1002,19 @@ def run_cli():
         print("Usage: ai-architect --license <TOKEN>\n")
         return
 
+    migrate_legacy_feedback()
+
     if args.test_mode:
         print("\n[DEMO MODE ACTIVATED] Preloading mock graphs and site surveys...")
         os.environ["ARCHAI_TEST_MODE"] = "1"
 
+    # Run the console's session loop (audits, Ollama/DB awaits) on uvloop when installed
+    try:
+        import uvloop
+        asyncio.set_event_loop_policy(uvloop.EventLoopPolicy())
+    except ImportError:
+        pass
+
     run_interactive_console()
 
 if __name__ == "__main__":
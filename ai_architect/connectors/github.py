@@ -3,6 +3,7 @@ import logging
 import subprocess
 import tempfile
 import shutil
+from concurrent.futures import ThreadPoolExecutor
 from typing import List, Optional, Dict, Any
 from github import Github, GithubException
 from pathlib import Path
@@ -12,15 +13,21 @@ from ..infrastructure.config_manager import config
 
 logger = logging.getLogger("ArchAI.GitHub")
 
+# Keep-alive HTTPS connections held by the shared GitHub session (urllib3 defaults to 10)
+GITHUB_POOL_SIZE = 20
+
+# Upper bound on concurrent per-file impact assessments in validate_local_diff
+VALIDATE_LOCAL_WORKERS = 8
+
 class GitHubConnector:
     """Connects ArchAI to GitHub for automated project analysis and risk assessment."""
     
-    def __init__(self, token: Optional[str] = None):
+    def __init__(self, token: Optional[str] = None, auditor: Optional[ArchitecturalAuditor] = None):
         self.token = token or config.get_secret("github.token") or config.get_secret("github_token")
         if not self.token:
             logger.warning("No GitHub token provided. Some operations may fail due to rate limiting.")
-        self.gh = Github(self.token) if self.token else Github()
-        self.auditor = ArchitecturalAuditor()
+        self.gh = Github(self.token, pool_size=GITHUB_POOL_SIZE) if self.token else Github(pool_size=GITHUB_POOL_SIZE)
+        self.auditor = auditor or ArchitecturalAuditor()
 
     def get_repo(self, repo_full_name: str):
         """Fetches a repository by its full name (e.g., 'owner/repo')."""
@@ -179,13 +186,17 @@ class GitHubConnector:
             if not files:
                 return []
 
-            reports = []
-            for file in files:
-                # 2. Run high-fidelity Impact Analysis on each changed file
-                impact = self.auditor.ImpactAnalyzer(repo_path, file)
-                reports.append(impact)
-            
-            return reports
+            # 2. Run high-fidelity Impact Analysis on each changed file.
+            # The dependency graph is the same for every file, so it is built once; the
+            # per-file CIRAS calls are independent and run concurrently.
+            from ..analysis.graph_engine import GraphEngine
+            engine = GraphEngine(Path(repo_path).resolve())
+            engine.analyze_project()
+            with ThreadPoolExecutor(max_workers=min(VALIDATE_LOCAL_WORKERS, len(files))) as pool:
+                return list(pool.map(
+                    lambda file: self.auditor.ImpactAnalyzer(repo_path, file, engine=engine),
+                    files
+                ))
         except Exception as e:
             logger.error(f"Local diff validation failed: {e}")
             return []
@@ -3,7 +3,9 @@ import json
 import logging
 import time
 import re
+import hashlib
 from pathlib import Path
+from concurrent.futures import ThreadPoolExecutor, Future
 from typing import Optional, List, Dict, Any
 from .prompts import (
     DISCOVERY_SYSTEM_PROMPT, 
@@ -39,9 +41,42 @@ from ..data.models import (
 from ..models.base import BaseAIModel
 from ..models.factory import get_model
 from ..infrastructure.caching import cache
+from ..analysis._ast_cache import _user_cache_dir
 
 logger = logging.getLogger("ArchAI.Auditor")
 
+# Threads used to walk top-level subtrees in scan_directory (1 disables the parallel walk)
+SCAN_WALK_WORKERS = min(32, (os.cpu_count() or 1) * 4)
+
+# Per-root manifests of scan_directory file snippets, reused while a file's (mtime_ns, size) is unchanged.
+# Kept as plain JSON in the per-user cache dir, never in (or loaded from) the scanned repo.
+SCAN_CACHE_DIR = _user_cache_dir() / "scan"
+
+def _scan_manifest_path(root: Path, max_depth: int) -> Path:
+    digest = hashlib.sha1(f"{root}:{max_depth}".encode("utf-8")).hexdigest()
+    return SCAN_CACHE_DIR / f"{digest}.json"
+
+def _load_scan_manifest(root: Path, max_depth: int) -> Dict[str, Any]:
+    """Returns {relative path: [[mtime_ns, size], snippet]}; anything unreadable counts as empty."""
+    try:
+        manifest = json.loads(_scan_manifest_path(root, max_depth).read_bytes())
+    except FileNotFoundError:
+        return {}
+    except Exception as e:
+        logger.debug(f"Scan manifest read failed for {root}: {e}")
+        return {}
+    return manifest if isinstance(manifest, dict) else {}
+
+def _save_scan_manifest(root: Path, max_depth: int, manifest: Dict[str, Any]):
+    try:
+        entry = _scan_manifest_path(root, max_depth)
+        entry.parent.mkdir(parents=True, exist_ok=True)
+        tmp = entry.with_suffix(f".{os.getpid()}.tmp")
+        tmp.write_text(json.dumps(manifest), encoding="utf-8")
+        os.replace(tmp, entry)
+    except Exception as e:
+        logger.debug(f"Scan manifest write failed for {root}: {e}")
+
 class ArchitecturalAuditor:
     def __init__(self, model: Optional[BaseAIModel] = None):
         self.model = model or get_model()
@@ -66,31 +101,94 @@ class ArchitecturalAuditor:
         if cached_summary: return cached_summary
         if not root.exists(): return f"Error: Directory {root} does not exist."
 
-        summary = f"Project Root: {root}\nStructure:\n"
         ignore_dirs = {'.git', '__pycache__', '.venv', 'venv', 'env', 'node_modules', 'dist', 'build'}
         relevant_extensions = {'.py', '.md', '.sql', '.yaml', '.yml', '.json', '.toml', '.env', 'Dockerfile'}
-        file_contents = ""
-        files_scanned = 0
-        for path in root.rglob('*'):
-            if any(part in ignore_dirs for part in path.parts): continue
-            try: depth = len(path.relative_to(root).parts)
-            except: depth = 0
-            if depth > max_depth: continue
+        snippet_extensions = {'.py', '.yaml', '.toml'}
+        manifest = _load_scan_manifest(root, max_depth)
+
+        def walk(directory: str, rel_prefix: str, depth: int, summary_parts: list, content_parts: list, fresh_manifest: dict, pool=None) -> int:
+            """
+            Pre-order scandir walk; ignored directories are pruned rather than filtered afterwards.
+            With a pool, each subdirectory is walked as its own task and left as a Future placeholder.
+            """
+            files = 0
+            try:
+                with os.scandir(directory) as it:
+                    entries = list(it)
+            except OSError:
+                return 0
             indent = ' ' * 4 * (depth - 1)
-            if path.is_dir():
-                summary += f"{indent}{path.name}/\n"
+            for entry in entries:
+                name = entry.name
+                if name in ignore_dirs: continue
+                if entry.is_dir(follow_symlinks=False):
+                    summary_parts.append(f"{indent}{name}/\n")
+                    if depth < max_depth:
+                        sub_args = (entry.path, rel_prefix + name + os.sep, depth + 1)
+                        if pool is None:
+                            files += walk(*sub_args, summary_parts, content_parts, fresh_manifest)
+                        else:
+                            future = pool.submit(walk_subtree, *sub_args)
+                            summary_parts.append(future)
+                            content_parts.append(future)
+                    continue
+                # Same rule as Path.suffix, without building a Path per entry
+                dot = name.rfind('.')
+                suffix = name[dot:].lower() if 0 < dot < len(name) - 1 else ''
+                if suffix not in relevant_extensions and name not in relevant_extensions: continue
+                summary_parts.append(f"{indent}{name}\n")
+                files += 1
+                if suffix not in snippet_extensions and name != 'Dockerfile': continue
+                try:
+                    rel = rel_prefix + name
+                    st = entry.stat()
+                    # Lists, not tuples, so fresh entries compare equal to ones loaded from JSON
+                    signature = [st.st_mtime_ns, st.st_size]
+                    cached = manifest.get(rel)
+                    if isinstance(cached, list) and len(cached) == 2 and cached[0] == signature:
+                        content = cached[1]
+                    else:
+                        with open(entry.path, 'r', encoding='utf-8', errors='ignore') as f:
+                            content = f.read()
+                        if len(content) > 1000: content = content[:700] + "\n...[TRUNCATED]...\n" + content[-300:]
+                    fresh_manifest[rel] = [signature, content]
+                    content_parts.append(f"--- FILE: {rel} ---\n{content}\n\n")
+                except: pass
+            return files
+
+        def walk_subtree(directory: str, rel_prefix: str, depth: int):
+            summary_parts, content_parts, manifest_part = [], [], {}
+            files = walk(directory, rel_prefix, depth, summary_parts, content_parts, manifest_part)
+            return summary_parts, content_parts, manifest_part, files
+
+        top_summary, top_contents, fresh_manifest = [], [], {}
+        if SCAN_WALK_WORKERS > 1 and max_depth > 1:
+            # Directory reads release the GIL, so top-level subtrees are read concurrently
+            with ThreadPoolExecutor(max_workers=SCAN_WALK_WORKERS) as pool:
+                files_scanned = walk(str(root), "", 1, top_summary, top_contents, fresh_manifest, pool=pool)
+        else:
+            files_scanned = walk(str(root), "", 1, top_summary, top_contents, fresh_manifest)
+
+        # Splice each subtree back into its placeholder so output order matches a sequential walk
+        summary_parts = [f"Project Root: {root}\nStructure:\n"]
+        content_parts = []
+        for part in top_summary:
+            if isinstance(part, Future):
+                sub_summary, _, sub_manifest, sub_files = part.result()
+                summary_parts.extend(sub_summary)
+                fresh_manifest.update(sub_manifest)
+                files_scanned += sub_files
             else:
-                if path.suffix.lower() in relevant_extensions or path.name in relevant_extensions:
-                    summary += f"{indent}{path.name}\n"
-                    files_scanned += 1
-                    try:
-                        if path.suffix.lower() in {'.py', '.yaml', '.toml'} or path.name in {'Dockerfile'}:
-                            with open(path, 'r', encoding='utf-8', errors='ignore') as f:
-                                content = f.read()
-                                if len(content) > 1000: content = content[:700] + "\n...[TRUNCATED]...\n" + content[-300:]
-                                file_contents += f"--- FILE: {path.relative_to(root)} ---\n{content}\n\n"
-                    except: pass
-        final_result = summary + f"\n\nTotal Files Scanned: {files_scanned}\n\nContents:\n" + file_contents
+                summary_parts.append(part)
+        for part in top_contents:
+            if isinstance(part, Future):
+                content_parts.extend(part.result()[1])
+            else:
+                content_parts.append(part)
+
+        if fresh_manifest != manifest:
+            _save_scan_manifest(root, max_depth, fresh_manifest)
+        final_result = "".join(summary_parts) + f"\n\nTotal Files Scanned: {files_scanned}\n\nContents:\n" + "".join(content_parts)
         cache.set("scanner", cache_key, final_result, ttl=300)
         return final_result
 
@@ -143,10 +241,14 @@ class ArchitecturalAuditor:
 
     def Discovery(self, repo_path: str) -> DiscoveryOutput:
         from ..analysis.graph_engine import GraphEngine
-        engine = GraphEngine(Path(repo_path))
-        engine.analyze_project()
-        arch_graph = engine.get_graph_summary()
-        structure = self.scan_directory(repo_path)
+        # The directory snapshot does not depend on the graph, so take it while the graph is analyzed.
+        # Safe only because GraphEngine's worker pool never forks this (now multi-threaded) process.
+        with ThreadPoolExecutor(max_workers=1) as pool:
+            structure_future = pool.submit(self.scan_directory, repo_path)
+            engine = GraphEngine(Path(repo_path))
+            engine.analyze_project()
+            arch_graph = engine.get_graph_summary()
+            structure = structure_future.result()
         prompt = f"Project: {repo_path}\nGraph Summary: {json.dumps(arch_graph.get('layer_stats', {}))}\nStructure:\n{structure[:4000]}"
         raw = self._call_llm_json(DISCOVERY_SYSTEM_PROMPT, prompt)
         return DiscoveryOutput(languages=raw.get("languages", ["python"]), frameworks=raw.get("frameworks", []), architecture_type=raw.get("architecture_type", "Unknown"), module_summary=raw.get("module_summary", {}), raw_structure=structure, architecture_graph=arch_graph)
@@ -214,7 +316,8 @@ class ArchitecturalAuditor:
         orchestrator = Orchestrator(self)
         return await orchestrator.run_pipeline(root_path, goals)
 
-    def ImpactAnalyzer(self, root_path: str, target: str, max_depth: int = 3) -> ImpactAssessment:
+    def ImpactAnalyzer(self, root_path: str, target: str, max_depth: int = 3, engine=None) -> ImpactAssessment:
+        """engine: an already analyzed GraphEngine for root_path, shared when assessing several targets."""
         from ..analysis.graph_engine import GraphEngine
         root = Path(root_path).resolve()
         
@@ -230,8 +333,9 @@ class ArchitecturalAuditor:
                 # Optional: You could update resolved_target to be the file path if GraphEngine supports it better
                 # resolved_target = str(rel_loc) 
         
-        engine = GraphEngine(root)
-        engine.analyze_project()
+        if engine is None:
+            engine = GraphEngine(root)
+            engine.analyze_project()
         
         # 1. Structural Signals
         impact_scope = engine.get_impact_scope(target, max_depth=max_depth)
@@ -272,11 +376,11 @@ class ArchitecturalAuditor:
     def WDPPlanner(self, root_path: str, goal: str, sprint_config: SprintPlanConfig = SprintPlanConfig()) -> WDPOutput:
         from ..analysis.graph_engine import GraphEngine
         engine = GraphEngine(Path(root_path))
-        engine.analyze_project()
+        engine.analyze_project() # Full pass: ImpactAnalyzer below reuses this engine
         arch_graph = engine.get_graph_summary()
         
         # 1. Get Impact Analysis for the Goal
-        impact = self.ImpactAnalyzer(root_path, goal)
+        impact = self.ImpactAnalyzer(root_path, goal, engine=engine)
         
         # 2. Get Historical Context (Aggregated churn)
         metrics = {
@@ -318,11 +422,11 @@ class ArchitecturalAuditor:
     def SRCEngine(self, root_path: str, goal: str, wdp_plan: WDPOutput, sprint_config: SprintPlanConfig = SprintPlanConfig(), strict: bool = False) -> SRCOutput:
         from ..analysis.graph_engine import GraphEngine
         engine = GraphEngine(Path(root_path))
-        engine.analyze_project()
+        engine.analyze_project() # Full pass: ImpactAnalyzer below reuses this engine
         arch_graph = engine.get_graph_summary()
         
         # 1. Get Impact Analysis for the Goal
-        impact = self.ImpactAnalyzer(root_path, goal)
+        impact = self.ImpactAnalyzer(root_path, goal, engine=engine)
         
         # 2. Extract metrics
         metrics = {
@@ -366,14 +470,15 @@ class ArchitecturalAuditor:
         artifacts = {}
         for path_str in artifact_paths:
             p = Path(path_str)
-            if p.exists():
-                try:
-                    with open(p, "r", encoding="utf-8") as f:
-                        content = json.load(f)
-                        if isinstance(content, list): content = content[:20] 
-                        artifacts[p.name] = content
-                except:
-                    artifacts[p.name] = "Error: Invalid JSON"
+            try:
+                with open(p, "r", encoding="utf-8") as f:
+                    content = json.load(f)
+                    if isinstance(content, list): content = content[:20]
+                    artifacts[p.name] = content
+            except FileNotFoundError:
+                continue
+            except:
+                artifacts[p.name] = "Error: Invalid JSON"
         
         prompt = XAI_SYSTEM_PROMPT.format(
             intent=intent,
@@ -36,7 +36,8 @@ class Orchestrator:
             if asyncio.iscoroutinefunction(func):
                 result = await func(*args, **kwargs)
             else:
-                result = func(*args, **kwargs)
+                # Agents block on LLM round-trips; keep the caller's event loop free meanwhile
+                result = await asyncio.to_thread(func, *args, **kwargs)
             latency = (time.time() - start_time) * 1000
             if result is None: raise ValueError(f"Agent {agent_name} returned None.")
             data_dict = result.model_dump() if hasattr(result, "model_dump") else result
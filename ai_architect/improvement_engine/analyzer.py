@@ -1,4 +1,5 @@
 import json
+from concurrent.futures import ThreadPoolExecutor
 from typing import List, Any, Optional
 from ..core_ai.prompts import IMPROVEMENT_SYSTEM_PROMPT
 from ..data.models import ImprovementSuggestion
@@ -6,6 +7,9 @@ from ..xai.explainer import XAI
 from ..models.base import BaseAIModel
 from ..models.factory import get_model
 
+# Upper bound on concurrent XAI explanation calls, however many strategies the model returns
+EXPLAIN_WORKERS = 4
+
 class ImprovementEngine:
     def __init__(self, model: Optional[BaseAIModel] = None):
         self.model = model or get_model()
@@ -37,11 +41,17 @@ class ImprovementEngine:
             data = json.loads(content)
             strategies_data = data.get('strategies', [])
             
+            # The per-strategy explanations are independent, so issue them concurrently.
+            # Ollama only serves them in parallel up to OLLAMA_NUM_PARALLEL on the server side.
+            # No runtime check here: like the auditor, callers ensure the model runtime up front.
+            with ThreadPoolExecutor(max_workers=max(1, min(EXPLAIN_WORKERS, len(strategies_data)))) as pool:
+                explanations = list(pool.map(
+                    lambda s: self.xai.explain_suggestion(s['description'], failure_details),
+                    strategies_data
+                ))
+            
             suggestions = []
-            for s in strategies_data:
-                # Generate XAI for each
-                explanation = self.xai.explain_suggestion(s['description'], failure_details)
-                
+            for s, explanation in zip(strategies_data, explanations):
                 s_obj = ImprovementSuggestion(
                     strategy_name=s['name'],
                     description=s['description'],
@@ -2,11 +2,42 @@ import json
 import hashlib
 import functools
 import asyncio
+import time
 from typing import Optional, Any, Callable
 import redis
+import redis.asyncio
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
 from .config_manager import config
 from .logging_utils import logger
 
+def _to_jsonable(value: Any) -> Any:
+    if hasattr(value, "model_dump"): # Pydantic v2
+        return value.model_dump(mode="json")
+    if hasattr(value, "dict"): # Pydantic v1
+        return value.dict()
+    return value
+
+def _dumps(value: Any) -> bytes:
+    """Serializes a cache value to JSON bytes (orjson when installed)."""
+    value = _to_jsonable(value)
+    if orjson is not None:
+        return orjson.dumps(value, option=orjson.OPT_NON_STR_KEYS)
+    return json.dumps(value).encode("utf-8")
+
+def _loads(raw: Any) -> Any:
+    if orjson is not None:
+        return orjson.loads(raw)
+    return json.loads(raw)
+
+def _key_default(obj: Any) -> Any:
+    """json.dumps fallback so models and other objects inside key data hash by content."""
+    obj = _to_jsonable(obj)
+    return obj if isinstance(obj, (dict, list)) else str(obj)
+
 class CacheLayer:
     """
     Unified caching layer supporting ephemeral (memory) and persistent (Redis) storage.
@@ -25,12 +56,14 @@ class CacheLayer:
         self.redis_url = config.get("cache.redis_url", None)
         self.ttl = config.get("cache.ttl", 3600) # Default 1 hour
         self.redis_client = None
-        self.local_cache = {} # Fallback
+        self.async_redis_client = None # Shared redis.asyncio pool for the async paths
+        self.local_cache = {} # Fallback: key -> (monotonic expiry, value)
 
         if self.enabled and self.redis_url:
             try:
                 self.redis_client = redis.from_url(self.redis_url, decode_responses=True)
                 self.redis_client.ping()
+                self.async_redis_client = redis.asyncio.from_url(self.redis_url, decode_responses=False)
                 logger.info(f"Redis Cache connected: {self.redis_url}")
             except Exception as e:
                 logger.warning(f"Failed to connect to Redis: {e}. Falling back to local dictionary cache.")
@@ -44,8 +77,8 @@ class CacheLayer:
                  data_str = data.model_dump_json()
             elif hasattr(data, "dict"): # Pydantic v1
                  data_str = json.dumps(data.dict(), sort_keys=True)
-            elif isinstance(data, (dict, list, str, int, float, bool, type(None))):
-                 data_str = json.dumps(data, sort_keys=True)
+            elif isinstance(data, (dict, list, tuple, str, int, float, bool, type(None))):
+                 data_str = json.dumps(data, sort_keys=True, default=_key_default)
             else:
                  data_str = str(data)
 
@@ -55,6 +88,20 @@ class CacheLayer:
             logger.warning(f"Cache key generation failed: {e}")
             return f"archai:{prefix}:invalid_key"
 
+    def _local_get(self, key: str) -> Optional[Any]:
+        entry = self.local_cache.get(key)
+        if entry is None:
+            return None
+        expires_at, value = entry
+        if time.monotonic() >= expires_at:
+            self.local_cache.pop(key, None)
+            return None
+        logger.debug(f"Cache HIT (Local): {key}")
+        return value
+
+    def _local_set(self, key: str, value: Any, ttl: int):
+        self.local_cache[key] = (time.monotonic() + ttl, value)
+
     def get(self, prefix: str, key_data: Any) -> Optional[Any]:
         """Retrieves data from cache."""
         if not self.enabled:
@@ -71,9 +118,8 @@ class CacheLayer:
                     return json.loads(cached_val)
             
             # 2. Try Local
-            elif key in self.local_cache:
-                logger.debug(f"Cache HIT (Local): {key}")
-                return self.local_cache[key]
+            else:
+                return self._local_get(key)
                 
         except Exception as e:
             logger.warning(f"Cache read error: {e}")
@@ -103,12 +149,67 @@ class CacheLayer:
             
             # 2. Save to Local
             else:
-                self.local_cache[key] = json.loads(val_str) # Store as dict to simulate retrieval
-                # Note: Local cache does not implement TTL eviction in this simple version
+                self._local_set(key, json.loads(val_str), ttl) # Store as dict to simulate retrieval
                 
         except Exception as e:
             logger.warning(f"Cache write error: {e}")
 
+    async def aget(self, prefix: str, key_data: Any) -> Optional[Any]:
+        """Async get(): reads through the shared redis.asyncio pool without blocking the event loop."""
+        if not self.enabled:
+            return None
+
+        key = self._generate_key(prefix, key_data)
+
+        try:
+            if self.async_redis_client:
+                cached_val = await self.async_redis_client.get(key)
+                if cached_val:
+                    logger.debug(f"Cache HIT (Redis): {key}")
+                    return _loads(cached_val)
+
+            else:
+                return self._local_get(key)
+
+        except Exception as e:
+            logger.warning(f"Cache read error: {e}")
+
+        return None
+
+    async def aset(self, prefix: str, key_data: Any, value: Any, ttl: int = None):
+        """Async set(): SETEX through the shared redis.asyncio pool."""
+        if not self.enabled:
+            return
+
+        key = self._generate_key(prefix, key_data)
+        ttl = ttl or self.ttl
+
+        try:
+            payload = _dumps(value)
+            if self.async_redis_client:
+                await self.async_redis_client.setex(key, ttl, payload)
+            else:
+                self._local_set(key, _loads(payload), ttl)
+
+        except Exception as e:
+            logger.warning(f"Cache write error: {e}")
+
+    async def adelete(self, prefix: str, key_data: Any):
+        """Removes an entry, e.g. a session on logout."""
+        if not self.enabled:
+            return
+
+        key = self._generate_key(prefix, key_data)
+
+        try:
+            if self.async_redis_client:
+                await self.async_redis_client.delete(key)
+            else:
+                self.local_cache.pop(key, None)
+
+        except Exception as e:
+            logger.warning(f"Cache delete error: {e}")
+
 # Singleton
 cache = CacheLayer()
 
@@ -134,13 +235,13 @@ def cached(prefix: str, ttl: int = 300):
         @functools.wraps(func)
         async def async_wrapper(*args, **kwargs):
             key_data = {"args": args, "kwargs": kwargs}
-            cached_result = cache.get(prefix, key_data)
+            cached_result = await cache.aget(prefix, key_data)
             
             if cached_result is not None:
                 return cached_result
             
             result = await func(*args, **kwargs)
-            cache.set(prefix, key_data, result, ttl)
+            await cache.aset(prefix, key_data, result, ttl)
             return result
 
         if asyncio.iscoroutinefunction(func):
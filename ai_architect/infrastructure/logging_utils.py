@@ -1,7 +1,9 @@
 import logging
+import queue
 import sys
 import time
 import functools
+from logging.handlers import QueueHandler, QueueListener
 from pathlib import Path
 from typing import Optional, Callable, Any
 
@@ -51,6 +53,29 @@ def setup_logger(name: str, log_file: Optional[str] = "archai.log", level: int =
 # Singleton logger
 logger = setup_logger("ArchAI")
 
+def start_queue_logging(target: logging.Logger = logger) -> QueueListener:
+    """
+    Moves the logger's handlers behind a QueueHandler so record formatting and
+    console/file I/O happen on a background thread. Undo with stop_queue_logging().
+    """
+    handlers = [h for h in target.handlers if not isinstance(h, QueueHandler)]
+    log_queue = queue.SimpleQueue()
+    for handler in handlers:
+        target.removeHandler(handler)
+    target.addHandler(QueueHandler(log_queue))
+    listener = QueueListener(log_queue, *handlers, respect_handler_level=True)
+    listener.start()
+    return listener
+
+def stop_queue_logging(listener: QueueListener, target: logging.Logger = logger):
+    """Drains the queue and reattaches the original handlers to the logger."""
+    listener.stop()
+    for handler in list(target.handlers):
+        if isinstance(handler, QueueHandler):
+            target.removeHandler(handler)
+    for handler in listener.handlers:
+        target.addHandler(handler)
+
 def retry(retries: int = 3, delay: float = 1.0, backoff: float = 2.0, exceptions: tuple = (Exception,)):
     """
     Retry decorator for functions that may fail due to transient issues.
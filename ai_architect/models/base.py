@@ -22,3 +22,7 @@ class BaseAIModel(ABC):
             The text content of the model's response.
         """
         pass
+
+    def warmup(self):
+        """Optionally preloads the model so the first real request does not pay for it."""
+        pass
@@ -34,3 +34,10 @@ class OllamaModel(BaseAIModel):
         except Exception as e:
             logger.error(f"Ollama Provider Error ({self.model_name}): {e}")
             raise LLMProviderError(f"Ollama failed: {str(e)}")
+
+    def warmup(self):
+        """Loads the model into Ollama's memory with an empty prompt; failures are only logged."""
+        try:
+            ollama.generate(model=self.model_name, prompt="")
+        except Exception as e:
+            logger.warning(f"Ollama warmup failed ({self.model_name}): {e}")
@@ -3,6 +3,14 @@ import sys
 import time
 from typing import List, Dict, Any
 
+def is_interactive() -> bool:
+    """
+    Progress animations only pace output for a person watching a terminal;
+    pipes, CI logs and ARCHAI_QUIET=1 get the finished bar straight away.
+    Checked per call so redirected stdout and later ARCHAI_QUIET changes apply.
+    """
+    return sys.stdout.isatty() and not os.environ.get("ARCHAI_QUIET")
+
 class ConsoleUI:
     """Handles professional, authoritative terminal output for ArchAI."""
 
@@ -46,8 +54,11 @@ class ConsoleUI:
     @staticmethod
     def progress_bar(label: str, duration: float = 1.0):
         """Simulates architectural analysis progress."""
-        print(f"  {label:30} [", end="", flush=True)
         steps = 20
+        if not is_interactive():
+            print(f"  {label:30} [{'A' * steps}] COMPLETE")
+            return
+        print(f"  {label:30} [", end="", flush=True)
         for i in range(steps):
             time.sleep(duration / steps)
             print("A", end="", flush=True)
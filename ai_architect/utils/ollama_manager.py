@@ -2,7 +2,14 @@ import subprocess
 import shutil
 import sys
 import time
+import json
+import threading
 from ..infrastructure.globals import AI_MODEL
+from ..analysis._ast_cache import _user_cache_dir
+
+# Last known-good model selection, reused across CLI invocations while fresh (seconds)
+OLLAMA_CACHE_PATH = _user_cache_dir() / "ollama.json"
+OLLAMA_CACHE_TTL = 600
 
 def run_command(command):
     """Runs a shell command and returns formatted output and exit code."""
@@ -26,7 +33,9 @@ def get_available_models():
     stdout, _, code = run_command("ollama list")
     if code != 0:
         return []
-    
+    return _parse_models(stdout)
+
+def _parse_models(stdout):
     # Parse output: NAME ID SIZE MODIFIED
     # Skip header
     lines = stdout.split('\n')[1:]
@@ -42,20 +51,24 @@ def check_ollama_status():
     Checks connection to Ollama.
     Returns: 'running', 'stopped', 'not_installed'
     """
+    return _probe_ollama()[0]
+
+def _probe_ollama():
+    """One `ollama list` call: returns (status, installed models) for check_ollama_status and setup."""
     if not is_ollama_installed():
-        return 'not_installed'
+        return 'not_installed', []
     
     # Try a simple list command to check if daemon is responsive
-    _, stderr, code = run_command("ollama list")
+    stdout, stderr, code = run_command("ollama list")
     
     # If connection refused or socket error, it usually goes to stderr or nonzero code
     if "could not connect" in stderr.lower() or "connection refused" in stderr.lower():
-        return 'stopped'
+        return 'stopped', []
     
     if code == 0:
-        return 'running'
+        return 'running', _parse_models(stdout)
         
-    return 'stopped' # Default fall back
+    return 'stopped', [] # Default fall back
 
 def pull_model(model_name):
     """Pulls a model using subprocess (blocking)."""
@@ -64,14 +77,63 @@ def pull_model(model_name):
     proc.wait()
     return proc.returncode == 0
 
+def _read_cached_model(preferred_model):
+    """Returns the cached selection for preferred_model if it was written within OLLAMA_CACHE_TTL."""
+    try:
+        if time.time() - OLLAMA_CACHE_PATH.stat().st_mtime > OLLAMA_CACHE_TTL:
+            return None
+        data = json.loads(OLLAMA_CACHE_PATH.read_text())
+    except (OSError, ValueError):
+        return None
+    if data.get("preferred_model") == preferred_model:
+        return data.get("selected_model")
+    return None
+
+def _write_cached_model(preferred_model, selected_model):
+    try:
+        OLLAMA_CACHE_PATH.parent.mkdir(parents=True, exist_ok=True)
+        OLLAMA_CACHE_PATH.write_text(json.dumps({"preferred_model": preferred_model, "selected_model": selected_model}))
+    except OSError:
+        pass
+
+# Model chosen by the first successful initialize_ollama in this process
+_selected_model = None
+_ollama_lock = threading.Lock()
+
+def ensure_ollama(preferred_model=None):
+    """
+    Runs initialize_ollama on first use only and returns the model it selected; later calls
+    in the same process return that selection for free. It may print, prompt or exit, so call
+    it from the CLI command handler before any spinner or worker.
+    """
+    global _selected_model
+    with _ollama_lock:
+        if _selected_model is None:
+            _selected_model = initialize_ollama(preferred_model)
+        return _selected_model
+
 def initialize_ollama(preferred_model=None):
     """
     Orchestrates the Ollama setup.
+    The runtime status is checked every time; a model selection made in the last
+    OLLAMA_CACHE_TTL seconds is reused only while that model is still installed.
+    Returns the selected model name.
     """
     preferred_model = preferred_model or AI_MODEL
     print("\n[Ollama Manager] Initializing AI Runtime...")
-    
-    status = check_ollama_status()
+    models = _require_running()
+
+    cached_model = _read_cached_model(preferred_model)
+    if cached_model and cached_model in models:
+        return cached_model
+
+    selected_model = _select_model(preferred_model, models)
+    _write_cached_model(preferred_model, selected_model)
+    return selected_model
+
+def _require_running():
+    """Exits with instructions unless the Ollama service is installed and responding; returns the installed models."""
+    status, models = _probe_ollama()
     
     if status == 'not_installed':
         print("CRITICAL: Ollama is not installed.")
@@ -83,9 +145,9 @@ def initialize_ollama(preferred_model=None):
         print("Attempting to start 'ollama serve' in background...")
         print("Please run 'ollama serve' in a separate terminal.")
         sys.exit(1)
+    return models
 
-    # Service is running, check models.
-    models = get_available_models()
+def _select_model(preferred_model, models):
     print(f"[Ollama Manager] Detected models: {models}")
     
     selected_model = None
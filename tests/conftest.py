@@ -0,0 +1,52 @@
+import pytest
+from ai_architect.analysis import _ast_cache
+from ai_architect.core_ai import auditor as auditor_module
+from ai_architect.infrastructure.caching import cache
+from ai_architect.utils import ollama_manager
+
+@pytest.fixture(autouse=True)
+def isolated_user_cache(tmp_path_factory, monkeypatch):
+    # Outside tmp_path, so cache files never show up in a scanned or fingerprinted test project
+    root = tmp_path_factory.mktemp("user_cache")
+    monkeypatch.setattr(_ast_cache, "CACHE_DIR", root / "ast")
+    monkeypatch.setattr(auditor_module, "SCAN_CACHE_DIR", root / "scan")
+    monkeypatch.setattr(ollama_manager, "OLLAMA_CACHE_PATH", root / "ollama.json")
+    return root
+
+@pytest.fixture
+def local_cache(monkeypatch):
+    """An empty, enabled in-memory CacheLayer, even when Redis is configured."""
+    monkeypatch.setattr(cache, "enabled", True)
+    monkeypatch.setattr(cache, "redis_client", None)
+    monkeypatch.setattr(cache, "async_redis_client", None)
+    monkeypatch.setattr(cache, "local_cache", {})
+    return cache
+
+@pytest.fixture
+def make_package(tmp_path):
+    """Builds pkg/ under tmp_path: base.py with BaseThing/helper plus `count` modules using them."""
+    def make(count: int):
+        pkg = tmp_path / "pkg"
+        pkg.mkdir()
+        (pkg / "__init__.py").write_text("")
+        (pkg / "base.py").write_text('"""Base module."""\nclass BaseThing:\n    def run(self):\n        return helper()\n\ndef helper():\n    return 1\n')
+        for i in range(count):
+            (pkg / f"mod_{i}.py").write_text(f"from .base import BaseThing\nimport os\n\ndef work_{i}():\n    os.getcwd()\n    return BaseThing().run()\n")
+        return tmp_path
+    return make
+
+@pytest.fixture
+def make_project(tmp_path):
+    """Builds tmp_path/project: a small package, a large file, docs, config and an ignored node_modules."""
+    def make():
+        project = tmp_path / "project"
+        (project / "pkg" / "sub").mkdir(parents=True)
+        (project / "node_modules" / "dep").mkdir(parents=True)
+        (project / "pkg" / "__init__.py").write_text("")
+        (project / "pkg" / "core.py").write_text("def run():\n    return 1\n")
+        (project / "pkg" / "sub" / "big.py").write_text("x = 1\n" * 400)
+        (project / "pkg" / "sub" / "notes.md").write_text("# Notes\n")
+        (project / "node_modules" / "dep" / "index.py").write_text("ignored = True\n")
+        (project / "pyproject.toml").write_text("[project]\nname = 'demo'\n")
+        return project
+    return make
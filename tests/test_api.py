@@ -0,0 +1,177 @@
+import orjson
+import pytest
+from types import SimpleNamespace
+from fastapi.testclient import TestClient
+from starlette.requests import Request
+from ai_architect import api
+from ai_architect.api import auth
+from ai_architect.data.models import WDPOutput
+from ai_architect.infrastructure.caching import cache
+
+pytestmark = pytest.mark.usefixtures("local_cache")
+
+REPORT = {
+    "summary": "Audit",
+    "tasks": [{"ticket_id": f"ARCH-{i}", "title": "Split the core module"} for i in range(3)],
+    "sprintPlan": [{"day": "Day 1", "tickets": ["ARCH-0"]}],
+}
+
+class _StubModel:
+    model_name = "stub-coder"
+
+class _StubAuditor:
+    """Stands in for ArchitecturalAuditor: counts audits and plans instead of calling a model."""
+
+    def __init__(self):
+        self.model = _StubModel()
+        self.report = REPORT
+        self.audits = 0
+        self.plans = 0
+
+    async def audit_project(self, root_path, user_context, expected_output):
+        self.audits += 1
+        return self.report
+
+    def WDPPlanner(self, root_path, goal, sprint_config=None):
+        self.plans += 1
+        return WDPOutput(epics=[{"name": goal, "tickets": []}], sprint_feasibility={"status": "OK"}, overall_confidence=0.9)
+
+@pytest.fixture
+def auditor(monkeypatch):
+    stub = _StubAuditor()
+    monkeypatch.setattr(api, "_auditor", stub)
+    return stub
+
+@pytest.fixture
+def client():
+    return TestClient(api.app, headers={"X-API-Key": api.API_KEY})
+
+@pytest.fixture
+def project(make_package):
+    return make_package(1)
+
+def _audit(client, project, **headers):
+    return client.post("/audit", json={"path": str(project)}, headers=headers)
+
+def test_audit_etag_round_trip(client, auditor, project):
+    first = _audit(client, project)
+    assert first.status_code == 200 and first.json() == REPORT
+    etag = first.headers["etag"]
+
+    again = _audit(client, project, **{"If-None-Match": etag})
+    assert again.status_code == 304 and again.headers["etag"] == etag and again.content == b""
+    assert _audit(client, project, **{"If-None-Match": f'"other", W/{etag}'}).status_code == 304
+    assert _audit(client, project, **{"If-None-Match": "*"}).status_code == 304
+    assert _audit(client, project, **{"If-None-Match": '"other"'}).status_code == 200
+    assert auditor.audits == 1
+
+def test_audit_not_modified_requires_cached_report(client, auditor, project):
+    etag = _audit(client, project).headers["etag"]
+    cache.local_cache.clear()
+
+    response = _audit(client, project, **{"If-None-Match": etag})
+    assert response.status_code == 200 and response.json() == REPORT
+    assert _audit(client, project.parent / "missing", **{"If-None-Match": "*"}).status_code == 200
+
+def test_audit_etag_changes_when_a_file_is_edited(client, auditor, project):
+    etag = _audit(client, project).headers["etag"]
+    (project / "pkg" / "mod_0.py").write_text("def work_0():\n    return 22\n")
+
+    response = _audit(client, project, **{"If-None-Match": etag})
+    assert response.status_code == 200 and response.headers["etag"] != etag
+    assert auditor.audits == 2
+
+def test_audit_etag_changes_with_model(client, auditor, project):
+    etag = _audit(client, project).headers["etag"]
+    auditor.model.model_name = "other-coder"
+    assert _audit(client, project, **{"If-None-Match": etag}).status_code == 200
+
+def test_audit_streams_ndjson_when_accepted(client, auditor, project):
+    response = _audit(client, project, Accept="application/x-ndjson")
+    assert response.status_code == 200
+    assert response.headers["content-type"] == "application/x-ndjson"
+    lines = [orjson.loads(line) for line in response.content.splitlines()]
+    assert [line["section"] for line in lines] == ["task", "task", "task", "sprint_day", "summary"]
+    assert lines[0] == {"section": "task", **REPORT["tasks"][0]}
+    assert lines[-1] == {"section": "summary", "summary": "Audit"}
+    assert _audit(client, project, Accept="application/x-ndjson", **{"If-None-Match": response.headers["etag"]}).status_code == 304
+
+@pytest.mark.parametrize("header, matches", [
+    (None, False),
+    ('"abc"', True),
+    ('W/"abc"', True),
+    ('"x", "abc"', True),
+    (' "x" ,W/"abc" ', True),
+    ("*", True),
+    ('"abcd"', False),
+    ("abc", False),
+])
+def test_if_none_match_parsing(header, matches):
+    assert api._etag_matches(header, '"abc"') is matches
+
+def test_large_reports_are_gzipped(client, auditor, project):
+    auditor.report = {**REPORT, "tasks": [{"ticket_id": f"ARCH-{i}", "title": "Split the core module"} for i in range(200)]}
+    response = _audit(client, project, **{"Accept-Encoding": "gzip"})
+    assert response.headers["content-encoding"] == "gzip"
+    assert int(response.headers["content-length"]) < len(orjson.dumps(auditor.report))
+    assert response.json() == auditor.report
+
+    health = client.get("/health", headers={"Accept-Encoding": "gzip"})
+    assert "content-encoding" not in health.headers
+
+def test_plan_cache_headers(client, auditor, project, monkeypatch):
+    now = [1000.0]
+    monkeypatch.setattr(api, "time", SimpleNamespace(time=lambda: now[0]))
+    body = {"path": str(project), "goal": "Harden core"}
+
+    first = client.post("/plan", json=body)
+    assert first.status_code == 200
+    assert (first.headers["x-cache"], first.headers["age"]) == ("MISS", "0")
+    assert first.headers["cache-control"] == f"private, max-age={api.PLAN_TTL}"
+
+    now[0] += 42
+    second = client.post("/plan", json=body)
+    assert (second.headers["x-cache"], second.headers["age"]) == ("HIT", "42")
+    assert second.headers["cache-control"] == f"private, max-age={api.PLAN_TTL - 42}"
+    assert second.json() == first.json() and auditor.plans == 1
+
+    assert client.post("/plan", json={**body, "days": 5}).headers["x-cache"] == "MISS"
+
+def _session_request(sid="s1"):
+    return Request({"type": "http", "headers": [], "session": {"sid": sid}})
+
+@pytest.fixture
+def session_store(monkeypatch):
+    """A stand-in Redis session store holding one GitHub login."""
+    records = {"s1": {"provider": "github", "identity": {"provider": "github", "login": "octocat", "email": None, "orgs": ["acme"]}}}
+    async def aget(prefix, key):
+        return records.get(key) if prefix == "session" else None
+    monkeypatch.setattr(cache, "async_redis_client", object())
+    monkeypatch.setattr(cache, "aget", aget)
+    for key in ("USERS", "ORGS", "DOMAINS"):
+        monkeypatch.delenv(f"ARCHAI_AUTH_ALLOWED_{key}", raising=False)
+    return records
+
+async def test_session_requires_allowlisted_identity(session_store, monkeypatch):
+    assert await auth.get_session(_session_request()) is None
+
+    monkeypatch.setenv("ARCHAI_AUTH_ALLOWED_USERS", "someone, OctoCat")
+    assert await auth.get_session(_session_request()) == session_store["s1"]
+    assert await auth.get_session(_session_request("unknown")) is None
+
+    monkeypatch.setenv("ARCHAI_AUTH_ALLOWED_USERS", "someone")
+    assert await auth.get_session(_session_request()) is None
+    monkeypatch.setenv("ARCHAI_AUTH_ALLOWED_ORGS", "acme")
+    assert await auth.get_session(_session_request()) == session_store["s1"]
+
+async def test_session_needs_shared_store(session_store, monkeypatch):
+    monkeypatch.setenv("ARCHAI_AUTH_ALLOWED_USERS", "octocat")
+    monkeypatch.setattr(cache, "async_redis_client", None)
+    assert await auth.get_session(_session_request()) is None
+
+def test_requests_without_key_or_session_are_rejected(auditor, project):
+    response = TestClient(api.app).post("/audit", json={"path": str(project)})
+    assert response.status_code == 403 and auditor.audits == 0
+
+if __name__ == "__main__":
+    pytest.main([__file__])
@@ -0,0 +1,35 @@
+import pytest
+from ai_architect.infrastructure import caching
+from ai_architect.infrastructure.caching import cache
+
+pytestmark = pytest.mark.usefixtures("local_cache")
+
+@pytest.fixture
+def clock(monkeypatch):
+    now = [1000.0]
+    monkeypatch.setattr(caching.time, "monotonic", lambda: now[0])
+    return now
+
+def test_local_entries_expire(clock):
+    cache.set("test", "k", {"v": 1}, ttl=10)
+    assert cache.get("test", "k") == {"v": 1}
+    clock[0] += 10
+    assert cache.get("test", "k") is None
+    assert cache.local_cache == {}
+
+async def test_local_async_entries_expire(clock):
+    await cache.aset("test", "k", [1, 2], ttl=5)
+    clock[0] += 4
+    assert await cache.aget("test", "k") == [1, 2]
+    clock[0] += 1
+    assert await cache.aget("test", "k") is None
+
+async def test_local_default_ttl_and_delete(clock):
+    await cache.aset("test", "k", "v")
+    clock[0] += cache.ttl - 1
+    assert await cache.aget("test", "k") == "v"
+    await cache.adelete("test", "k")
+    assert await cache.aget("test", "k") is None
+
+if __name__ == "__main__":
+    pytest.main([__file__])
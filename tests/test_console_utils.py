@@ -0,0 +1,28 @@
+import io
+import pytest
+from ai_architect.utils import console_utils
+from ai_architect.utils.console_utils import ConsoleUI
+
+class _Terminal(io.StringIO):
+    def isatty(self):
+        return True
+
+def test_progress_bar_checks_terminal_per_call(monkeypatch):
+    sleeps = []
+    monkeypatch.setattr(console_utils.time, "sleep", sleeps.append)
+    monkeypatch.delenv("ARCHAI_QUIET", raising=False)
+
+    monkeypatch.setattr(console_utils.sys, "stdout", _Terminal())
+    ConsoleUI.progress_bar("Mapping", duration=1.0)
+    assert len(sleeps) == 20
+
+    monkeypatch.setenv("ARCHAI_QUIET", "1")
+    ConsoleUI.progress_bar("Mapping", duration=1.0)
+    monkeypatch.delenv("ARCHAI_QUIET")
+    monkeypatch.setattr(console_utils.sys, "stdout", io.StringIO())
+    ConsoleUI.progress_bar("Mapping", duration=1.0)
+    assert len(sleeps) == 20
+    assert "COMPLETE" in console_utils.sys.stdout.getvalue()
+
+if __name__ == "__main__":
+    pytest.main([__file__])
@@ -0,0 +1,68 @@
+import json
+import pytest
+from datetime import datetime
+from ai_architect import cli
+
+@pytest.fixture
+def files(tmp_path):
+    return tmp_path / "archai_feedback.json", tmp_path / "archai_feedback.jsonl"
+
+def _migrate(legacy, feedback):
+    cli.migrate_legacy_feedback(legacy_file=str(legacy), feedback_file=str(feedback))
+
+def _read_log(path):
+    return [json.loads(line) for line in path.read_bytes().splitlines() if line.strip()]
+
+def test_legacy_entries_move_ahead_of_jsonl_history(files):
+    legacy, feedback = files
+    old = [{"timestamp": 1.0, "useful": True, "rejected_ids": []}, {"timestamp": 2.0, "useful": False, "rejected_ids": ["ARCH-1"]}]
+    legacy.write_text(json.dumps(old))
+    feedback.write_bytes(cli._dump_line({"timestamp": 3.0, "useful": True, "rejected_ids": []}))
+
+    _migrate(legacy, feedback)
+
+    assert not legacy.exists()
+    assert [e["timestamp"] for e in _read_log(feedback)] == [1.0, 2.0, 3.0]
+    assert _read_log(feedback)[:2] == old
+
+def test_migration_without_existing_history(files):
+    legacy, feedback = files
+    legacy.write_text(json.dumps([{"timestamp": 1.0, "useful": True, "rejected_ids": []}]))
+    _migrate(legacy, feedback)
+    assert len(_read_log(feedback)) == 1
+
+def test_legacy_string_timestamps_become_epoch_seconds(files):
+    legacy, feedback = files
+    stamp = datetime(2024, 5, 1, 12, 30, 15, 250000)
+    old = [{"timestamp": str(stamp), "useful": True, "rejected_ids": []}, {"timestamp": "not a date", "useful": False, "rejected_ids": []}]
+    legacy.write_text(json.dumps(old))
+    feedback.write_bytes(cli._dump_line({"timestamp": 3.0, "useful": True, "rejected_ids": []}))
+
+    _migrate(legacy, feedback)
+
+    assert [e["timestamp"] for e in _read_log(feedback)] == [stamp.timestamp(), None, 3.0]
+
+def test_running_twice_is_a_no_op(files):
+    legacy, feedback = files
+    legacy.write_text(json.dumps([{"timestamp": 1.0, "useful": True, "rejected_ids": []}]))
+    _migrate(legacy, feedback)
+    migrated = feedback.read_bytes()
+
+    _migrate(legacy, feedback)
+    assert feedback.read_bytes() == migrated
+
+def test_corrupt_legacy_file_is_left_in_place(files, monkeypatch):
+    legacy, feedback = files
+    legacy.write_text('[{"timestamp": 1.0, "useful": tr')
+    feedback.write_bytes(cli._dump_line({"timestamp": 3.0, "useful": True, "rejected_ids": []}))
+    warnings = []
+    monkeypatch.setattr(cli.logger, "warning", warnings.append)
+
+    _migrate(legacy, feedback)
+
+    assert legacy.read_text() == '[{"timestamp": 1.0, "useful": tr'
+    assert [e["timestamp"] for e in _read_log(feedback)] == [3.0]
+    assert len(warnings) == 1 and str(legacy) in warnings[0]
+
+if __name__ == "__main__":
+    pytest.main([__file__])
@@ -0,0 +1,234 @@
+import os
+import shutil
+import subprocess
+import pytest
+from ai_architect.analysis import graph_engine, _ast_cache
+from ai_architect.analysis.graph_engine import GraphEngine
+
+def _snapshot(engine: GraphEngine):
+    return {
+        name: (node.classes, sorted(node.functions), node.imports, node.docstring)
+        for name, node in engine.nodes.items()
+    }
+
+def test_analyze_project_small(make_package):
+    engine = GraphEngine(make_package(2))
+    engine.analyze_project()
+    base = engine.nodes["pkg.base"]
+    assert base.docstring == "Base module."
+    assert base.classes == {"BaseThing": ["run"]}
+    assert base.functions["BaseThing.run"].calls == ["helper"]
+    assert engine.nodes["pkg.mod_0"].imports == ["pkg.base", "os"]
+    assert engine.nodes["pkg.base"].metrics["fan_in"] == 2
+
+def test_ignored_directories_are_skipped(make_package):
+    root = make_package(1)
+    (root / "node_modules" / "pkg").mkdir(parents=True)
+    (root / "node_modules" / "pkg" / "vendored.py").write_text("import os\n")
+    (root / "pkg" / "__pycache__").mkdir()
+    (root / "pkg" / "__pycache__" / "stale.py").write_text("")
+    engine = GraphEngine(root)
+    engine.analyze_project()
+    assert sorted(engine.nodes) == ["pkg.__init__", "pkg.base", "pkg.mod_0"]
+
+def test_resolve_internal_longest_prefix(make_package):
+    engine = GraphEngine(make_package(1))
+    engine.analyze_project()
+    assert engine._resolve_internal("pkg.base") == "pkg.base"
+    assert engine._resolve_internal("pkg.base.BaseThing") == "pkg.base"
+    assert engine._resolve_internal("pkg.baseline") is None
+    assert engine._resolve_internal("os") is None
+
+def test_dependency_depth_is_order_independent(tmp_path):
+    (tmp_path / "a.py").write_text("import c\nimport b\n")
+    (tmp_path / "b.py").write_text("import c\n")
+    (tmp_path / "c.py").write_text("import d\n")
+    (tmp_path / "d.py").write_text("x = 1\n")
+    (tmp_path / "e.py").write_text("import f\n")
+    (tmp_path / "f.py").write_text("import e\n")
+    engine = GraphEngine(tmp_path)
+    engine.analyze_project()
+    depths = {name: node.metrics["dependency_depth"] for name, node in engine.nodes.items()}
+    assert depths["a"] == 3
+    assert depths["b"] == 2
+    assert depths["d"] == 0
+    assert depths["e"] >= 1 and depths["f"] >= 1
+
+def test_imports_only_mode_matches_full_metrics(tmp_path, monkeypatch, make_package):
+    root = make_package(3)
+    full = GraphEngine(root)
+    full.analyze_project()
+
+    monkeypatch.setattr(_ast_cache, "CACHE_DIR", tmp_path / "empty_cache")
+    light = GraphEngine(root)
+    light.analyze_project(full=False)
+
+    for name, node in full.nodes.items():
+        assert light.nodes[name].imports == node.imports
+        assert light.nodes[name].metrics == node.metrics
+        assert light.nodes[name].ownership == node.ownership
+    assert light.nodes["pkg.base"].functions == {}
+
+def test_imports_only_mode_ignores_cache_state(make_package):
+    root = make_package(2)
+    # An import below the first def is invisible to the header scan but cached by a full parse
+    (root / "pkg" / "late.py").write_text("def f():\n    pass\n\nfrom .base import helper\n")
+    cold = GraphEngine(root)
+    cold.analyze_project(full=False)
+
+    GraphEngine(root).analyze_project()
+    warm = GraphEngine(root)
+    warm.analyze_project(full=False)
+
+    assert _snapshot(warm) == _snapshot(cold)
+    assert {n: node.metrics for n, node in warm.nodes.items()} == {n: node.metrics for n, node in cold.nodes.items()}
+    assert warm.nodes["pkg.late"].imports == []
+
+def test_summary_relationships_are_unique(make_package):
+    root = make_package(1)
+    (root / "pkg" / "mod_0.py").write_text("import pkg.base\nfrom pkg.base import BaseThing, helper\nfrom .base import helper as h\n")
+    engine = GraphEngine(root)
+    engine.analyze_project()
+    pairs = [(rel["from"], rel["to"]) for rel in engine.get_graph_summary()["relationships"]]
+    assert pairs.count(("pkg.mod_0", "pkg.base")) == 1
+    assert len(pairs) == len(set(pairs))
+
+def test_graph_summary_is_memoized_until_reanalysis(make_package):
+    root = make_package(2)
+    engine = GraphEngine(root)
+    engine.analyze_project()
+    summary = engine.get_graph_summary()
+    assert engine.get_graph_summary() is summary
+
+    (root / "pkg" / "extra.py").write_text("from .base import helper\n")
+    engine.analyze_project()
+    refreshed = engine.get_graph_summary()
+    assert refreshed is not summary
+    assert "pkg.extra" in refreshed["modules"]
+
+def test_parallel_matches_sequential(tmp_path, monkeypatch, make_package):
+    root = make_package(graph_engine.PARALLEL_ANALYSIS_THRESHOLD + 4)
+    parallel = GraphEngine(root)
+    parallel.analyze_project()
+
+    monkeypatch.setattr(graph_engine, "PARALLEL_ANALYSIS_THRESHOLD", 10**6)
+    monkeypatch.setattr(_ast_cache, "CACHE_DIR", tmp_path / "sequential_cache")
+    sequential = GraphEngine(root)
+    sequential.analyze_project()
+
+    assert _snapshot(parallel) == _snapshot(sequential)
+    assert sorted(parallel.nodes["pkg.mod_3"].functions["work_3"].calls) == ["BaseThing", "os.getcwd"]
+
+def test_warm_run_skips_worker_pool(monkeypatch, make_package):
+    root = make_package(graph_engine.PARALLEL_ANALYSIS_THRESHOLD + 4)
+    cold = GraphEngine(root)
+    cold.analyze_project()
+
+    def no_pool():
+        raise AssertionError("worker pool started for a fully cached project")
+    monkeypatch.setattr(graph_engine, "_get_analysis_pool", no_pool)
+    warm = GraphEngine(root)
+    warm.analyze_project()
+    assert _snapshot(warm) == _snapshot(cold)
+
+def test_analysis_pool_does_not_fork():
+    # Discovery scans the tree on a thread while the pool is in use, which is only safe without fork
+    pool = graph_engine._get_analysis_pool()
+    assert pool is graph_engine._get_analysis_pool()
+    assert pool._mp_context.get_start_method() in ("forkserver", "spawn")
+
+def test_ownership_uses_normalized_path(tmp_path):
+    node = graph_engine.ModuleNode(tmp_path / "app" / "core" / ".." / "api" / "routes.py", "app.api.routes")
+    assert node._norm_path == os.path.normcase(os.path.normpath(str(tmp_path / "app" / "api" / "routes.py")))
+    assert GraphEngine(tmp_path)._infer_ownership(node) == "Interface"
+
+def test_calls_in_parameter_annotations_are_recorded(tmp_path):
+    (tmp_path / "routes.py").write_text(
+        "from typing import Annotated\n"
+        "from fastapi import Depends\n"
+        "from .db import get_db, Session\n\n"
+        "def read_items(db: Annotated[Session, Depends(get_db)], limit: int = config.limit()):\n"
+        "    return db.query()\n"
+    )
+    engine = GraphEngine(tmp_path)
+    engine.analyze_project()
+    assert sorted(engine.nodes["routes"].functions["read_items"].calls) == ["Depends", "config.limit", "db.query"]
+
+def test_churn_survives_non_utf8_paths_in_history(make_package):
+    if shutil.which("git") is None:
+        pytest.skip("git not installed")
+    root = make_package(1)
+    (root / os.fsdecode(b"caf\xe9.py")).write_bytes(b"import os\n")
+    git = ["git", "-c", "user.name=t", "-c", "user.email=t@t", "-c", "commit.gpgsign=false"]
+    subprocess.run(["git", "init", "-q"], cwd=root, check=True)
+    subprocess.run(git + ["add", "-A"], cwd=root, check=True)
+    subprocess.run(git + ["commit", "-q", "-m", "init"], cwd=root, check=True)
+
+    engine = GraphEngine(root)
+    engine.analyze_project()
+    assert engine.nodes["pkg.base"].metrics["churn"] == 1
+    assert engine.nodes[os.fsdecode(b"caf\xe9")].metrics["churn"] == 1
+
+def test_parses_empty_and_non_utf8_files(tmp_path):
+    (tmp_path / "empty.py").write_bytes(b"")
+    (tmp_path / "legacy.py").write_bytes(b'"""Caf\xe9 module."""\nimport os\n')
+    engine = GraphEngine(tmp_path)
+    engine.analyze_project()
+    assert engine.nodes["empty"].imports == []
+    assert engine.nodes["legacy"].imports == ["os"]
+    assert engine.nodes["legacy"].docstring == "Caf module."
+
+def test_impact_scope_traces_callers_breadth_first(make_package):
+    root = make_package(2)
+    (root / "pkg" / "cli.py").write_text("from .mod_0 import work_0\n\ndef main():\n    return work_0()\n")
+    engine = GraphEngine(root)
+    engine.analyze_project()
+
+    callers = {item["name"]: item["depth"] for item in engine.get_impact_scope("pkg.base.BaseThing")}
+    assert callers["pkg.mod_0.work_0"] == 1
+    assert callers["pkg.mod_1.work_1"] == 1
+    assert callers["pkg.cli.main"] == 2
+    assert callers["Module Import: pkg.mod_0"] == 1
+
+    callers = {item["name"] for item in engine.get_impact_scope("pkg.base.helper", max_depth=1)}
+    assert {name for name in callers if not name.startswith("Module Import")} == {"pkg.base.BaseThing.run"}
+
+def test_ast_cache_hit_and_invalidation(monkeypatch, make_package):
+    root = make_package(1)
+    GraphEngine(root).analyze_project()
+
+    real_parse = graph_engine.ast.parse
+    def fail_parse(*args, **kwargs):
+        raise AssertionError("cached file was re-parsed")
+    monkeypatch.setattr(graph_engine.ast, "parse", fail_parse)
+    cached = GraphEngine(root)
+    cached.analyze_project()
+    assert cached.nodes["pkg.base"].classes == {"BaseThing": ["run"]}
+
+    monkeypatch.setattr(graph_engine.ast, "parse", real_parse)
+    (root / "pkg" / "base.py").write_text("class BaseThing:\n    def run(self):\n        pass\n    def stop(self):\n        pass\n")
+    fresh = GraphEngine(root)
+    fresh.analyze_project()
+    assert fresh.nodes["pkg.base"].classes == {"BaseThing": ["run", "stop"]}
+
+def test_ast_cache_is_keyed_by_module_name(make_package):
+    root = make_package(1)
+    GraphEngine(root).analyze_project()
+
+    # Same files, different analysis root: relative imports must resolve against the new module names
+    sub = GraphEngine(root / "pkg")
+    sub.analyze_project()
+    assert sub.nodes["mod_0"].imports == ["base", "os"]
+    assert sub.nodes["base"].metrics["fan_in"] == 1
+
+def test_ast_cache_entries_are_json(tmp_path, make_package):
+    GraphEngine(make_package(1)).analyze_project()
+    entries = list(_ast_cache.CACHE_DIR.glob("*.json"))
+    assert entries and not list(_ast_cache.CACHE_DIR.glob("*.pkl"))
+    warm = GraphEngine(tmp_path)
+    warm.analyze_project()
+    run = warm.nodes["pkg.base"].functions["BaseThing.run"]
+    assert (run.name, run.lineno, run.calls) == ("run", 3, ["helper"])
+
+if __name__ == "__main__":
+    pytest.main([__file__])
@@ -0,0 +1,39 @@
+import pytest
+from ai_architect.analysis import _ast_cache
+from ai_architect.utils import ollama_manager
+
+def _installed(monkeypatch, models):
+    monkeypatch.setattr(ollama_manager, "_probe_ollama", lambda: ("running", models))
+
+def test_cache_lives_in_the_archai_user_cache_dir(monkeypatch):
+    monkeypatch.undo()
+    assert ollama_manager.OLLAMA_CACHE_PATH.parent == _ast_cache._user_cache_dir()
+
+def test_cached_selection_is_reused_while_installed(monkeypatch):
+    ollama_manager._write_cached_model("preferred", "fallback:7b")
+    _installed(monkeypatch, ["fallback:7b"])
+    monkeypatch.setattr(ollama_manager, "_select_model", lambda *a: pytest.fail("selection re-run"))
+    assert ollama_manager.initialize_ollama("preferred") == "fallback:7b"
+
+def test_deleted_cached_model_is_reselected(monkeypatch):
+    ollama_manager._write_cached_model("preferred", "deleted:7b")
+    _installed(monkeypatch, ["preferred"])
+    assert ollama_manager.initialize_ollama("preferred") == "preferred"
+    assert ollama_manager._read_cached_model("preferred") == "preferred"
+
+def test_stopped_runtime_exits_even_with_a_warm_cache(monkeypatch):
+    ollama_manager._write_cached_model("preferred", "preferred")
+    monkeypatch.setattr(ollama_manager, "_probe_ollama", lambda: ("stopped", []))
+    with pytest.raises(SystemExit):
+        ollama_manager.initialize_ollama("preferred")
+
+def test_ensure_ollama_returns_the_selection_once(monkeypatch):
+    monkeypatch.setattr(ollama_manager, "_selected_model", None)
+    calls = []
+    monkeypatch.setattr(ollama_manager, "initialize_ollama", lambda preferred=None: calls.append(preferred) or "picked")
+    assert ollama_manager.ensure_ollama() == "picked"
+    assert ollama_manager.ensure_ollama() == "picked"
+    assert calls == [None]
+
+if __name__ == "__main__":
+    pytest.main([__file__])
@@ -0,0 +1,46 @@
+import pytest
+from ai_architect import cli
+
+@pytest.mark.parametrize("repo", [
+    "owner/repo",
+    "/owner/repo/",
+    "https://github.com/owner/repo",
+    "https://github.com/owner/repo.git",
+    "https://github.com/owner/repo/",
+    "https://github.com/owner/repo.git/",
+    "http://www.github.com/owner/repo",
+    "github.com/owner/repo",
+    "git@github.com:owner/repo.git",
+    "git@github.com:owner/repo",
+    "ssh://git@github.com/owner/repo.git",
+])
+def test_repo_full_name_accepts_github_forms(repo):
+    assert cli._repo_full_name(repo) == "owner/repo"
+
+def test_repo_full_name_keeps_dots_and_underscores():
+    assert cli._repo_full_name("https://github.com/my-org/my_repo.js.git") == "my-org/my_repo.js"
+
+@pytest.mark.parametrize("repo", [
+    "",
+    "owner",
+    "owner/repo/pulls",
+    "https://github.com/owner",
+    "https://github.com/owner/repo/pull/1",
+    "https://gitlab.com/owner/repo",
+    "https://notgithub.com/owner/repo",
+    "git@gitlab.com:owner/repo.git",
+    "owner/repo name",
+])
+def test_repo_full_name_rejects_invalid_input(repo):
+    with pytest.raises(ValueError):
+        cli._repo_full_name(repo)
+
+def test_github_command_reports_invalid_repo(monkeypatch, capsys):
+    def no_connector():
+        raise AssertionError("connector built for an invalid repo")
+    monkeypatch.setattr(cli, "_get_github", no_connector)
+    cli._cmd_github(["PRS", "https://gitlab.com/owner/repo"])
+    assert "Not a GitHub repository" in capsys.readouterr().out
+
+if __name__ == "__main__":
+    pytest.main([__file__])
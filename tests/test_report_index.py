@@ -0,0 +1,90 @@
+import json
+import pytest
+from ai_architect import cli
+
+def _report():
+    tasks = [
+        {"ticket_id": "ARCH-1", "title": "Split \"core\" module", "priority": "High", "effort_min": 2.0, "tags": ["api", "db"], "evidence": {"file_path": "core.py", "line_range": [1, 40]}},
+        {"ticket_id": "ARCH-2", "title": "Café ✓ unicode", "priority": "Low", "tags": [], "evidence": {}, "subtasks": [{"title": "nested\nnewline"}]},
+        {"ticket_id": "ARCH-3", "title": "Empty", "risk_flags": None},
+    ]
+    return {
+        "summary": "Audit",
+        "tasks": tasks,
+        "sprintPlan": [{"day": "Day 1", "tickets": [{"ticket_id": "ARCH-1"}]}],
+        "meta": {"tasks": ["not", "the", "top-level", "key"]},
+    }
+
+@pytest.fixture(autouse=True)
+def fresh_cache(monkeypatch):
+    monkeypatch.setattr(cli, "_report_cache", {})
+
+@pytest.fixture(params=["orjson", "json"])
+def encoder(request, monkeypatch):
+    if request.param == "json":
+        monkeypatch.setattr(cli, "orjson", None)
+    return request.param
+
+def test_serialize_matches_dump_and_offsets_slice_each_ticket(encoder):
+    report = _report()
+    raw, offsets = cli._serialize_report(report)
+    assert raw == cli._dump_json(report)
+    assert sorted(offsets) == ["ARCH-1", "ARCH-2", "ARCH-3"]
+    for task in report["tasks"]:
+        start, end = offsets[task["ticket_id"]]
+        assert raw[start:end] == cli._dump_json(task).replace(b"\n", b"\n    ")
+        assert json.loads(raw[start:end]) == task
+
+def test_serialize_without_tasks(encoder):
+    report = {"summary": "nothing", "tasks": []}
+    assert cli._serialize_report(report) == (cli._dump_json(report), {})
+
+def test_indexed_ticket_round_trips(tmp_path, encoder):
+    path = str(tmp_path / "report.json")
+    report = _report()
+    cli.write_report(report, path)
+    signature = cli._file_signature(path)
+    for task in report["tasks"]:
+        assert cli._read_indexed_ticket(task["ticket_id"], path, signature) == task
+    assert cli._read_indexed_ticket("ARCH-404", path, signature) is None
+
+    cli._report_cache.clear()
+    assert cli.find_ticket("ARCH-2", path) == report["tasks"][1]
+
+def test_stale_index_falls_back(tmp_path):
+    path = str(tmp_path / "report.json")
+    cli.write_report(_report(), path)
+    index = (tmp_path / "report.idx.json").read_bytes()
+
+    # Another writer replaces the report without refreshing the sidecar
+    changed = _report()
+    changed["tasks"].insert(0, {"ticket_id": "ARCH-0", "title": "Shifts every offset"})
+    (tmp_path / "report.json").write_bytes(cli._dump_json(changed))
+    (tmp_path / "report.idx.json").write_bytes(index)
+    cli._report_cache.clear()
+
+    signature = cli._file_signature(path)
+    assert cli._read_indexed_ticket("ARCH-1", path, signature) is cli._EMPTY
+    assert cli.find_ticket("ARCH-1", path) == changed["tasks"][1]
+    assert cli.find_ticket("ARCH-0", path) == changed["tasks"][0]
+
+@pytest.mark.parametrize("use_ijson", [True, False])
+def test_missing_index_falls_back(tmp_path, monkeypatch, use_ijson):
+    if not use_ijson:
+        monkeypatch.setattr(cli, "ijson", None)
+    path = str(tmp_path / "report.json")
+    report = _report()
+    cli.write_report(report, path)
+    (tmp_path / "report.idx.json").unlink()
+    cli._report_cache.clear()
+
+    assert cli._read_indexed_ticket("ARCH-3", path, cli._file_signature(path)) is cli._EMPTY
+    assert cli.find_ticket("ARCH-3", path) == report["tasks"][2]
+    assert cli.find_ticket("ARCH-404", path) is None
+
+def test_find_ticket_without_report(tmp_path):
+    with pytest.raises(FileNotFoundError):
+        cli.find_ticket("ARCH-1", str(tmp_path / "missing.json"))
+
+if __name__ == "__main__":
+    pytest.main([__file__])
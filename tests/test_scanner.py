@@ -0,0 +1,84 @@
+import pytest
+from ai_architect.core_ai import auditor as auditor_module
+from ai_architect.core_ai.auditor import ArchitecturalAuditor
+from ai_architect.infrastructure.caching import cache
+
+@pytest.fixture(autouse=True)
+def no_summary_cache(monkeypatch):
+    # Scan summaries are also cached in the CacheLayer, which would hide the manifest behaviour
+    monkeypatch.setattr(cache, "enabled", False)
+
+def test_scan_lists_relevant_files_and_truncates(make_project):
+    result = ArchitecturalAuditor(model=object()).scan_directory(make_project())
+    assert "Total Files Scanned: 5" in result
+    assert "--- FILE: pkg/core.py ---\ndef run():" in result
+    assert "...[TRUNCATED]..." in result
+    assert "notes.md" in result and "--- FILE: pkg/sub/notes.md" not in result
+    assert "node_modules" not in result and "ignored = True" not in result
+
+def test_scan_manifest_reuses_unchanged_files(monkeypatch, make_project):
+    project = make_project()
+    auditor = ArchitecturalAuditor(model=object())
+    first = auditor.scan_directory(project)
+
+    real_open = open
+    def guarded_open(path, *args, **kwargs):
+        if str(path).startswith(str(project)):
+            raise AssertionError(f"unchanged file was re-read: {path}")
+        return real_open(path, *args, **kwargs)
+    monkeypatch.setattr("builtins.open", guarded_open)
+    assert auditor.scan_directory(project) == first
+
+    monkeypatch.setattr("builtins.open", real_open)
+    (project / "pkg" / "core.py").write_text("def run():\n    return 2\n")
+    refreshed = auditor.scan_directory(project)
+    assert "return 2" in refreshed and "return 1" not in refreshed
+
+def test_scan_manifest_is_json_in_cache_dir(monkeypatch, make_project):
+    project = make_project()
+    monkeypatch.chdir(project)
+    auditor = ArchitecturalAuditor(model=object())
+    auditor.scan_directory(project)
+
+    entries = list(auditor_module.SCAN_CACHE_DIR.glob("*"))
+    assert [e.suffix for e in entries] == [".json"]
+    assert not (project / ".archai_cache").exists()
+    written = entries[0].stat().st_mtime_ns
+    auditor.scan_directory(project)
+    assert entries[0].stat().st_mtime_ns == written # unchanged tree: manifest not rewritten
+
+def test_parallel_walk_matches_sequential(tmp_path, monkeypatch, make_project):
+    project = make_project()
+    for i in range(6):
+        (project / f"svc_{i}" / "deep" / "deeper" / "deepest").mkdir(parents=True)
+        (project / f"svc_{i}" / "app.py").write_text(f"APP = {i}\n")
+        (project / f"svc_{i}" / "deep" / "deeper" / "conf.yaml").write_text("k: v\n")
+        (project / f"svc_{i}" / "deep" / "deeper" / "deepest" / "hidden.py").write_text("too_deep = True\n")
+    parallel = ArchitecturalAuditor(model=object()).scan_directory(project)
+
+    monkeypatch.setattr(auditor_module, "SCAN_WALK_WORKERS", 1)
+    monkeypatch.setattr(auditor_module, "SCAN_CACHE_DIR", tmp_path / "sequential_cache")
+    assert ArchitecturalAuditor(model=object()).scan_directory(project) == parallel
+    assert "Total Files Scanned: 17" in parallel
+    assert "deepest/" in parallel and "too_deep" not in parallel
+
+class _EmptyModel:
+    def chat(self, messages, format=None):
+        return "{}"
+
+def test_planner_analyzes_project_once(tmp_path, monkeypatch, make_project):
+    from ai_architect.analysis import graph_engine
+    passes = []
+    analyze = graph_engine.GraphEngine.analyze_project
+    def counting(self, full=True):
+        passes.append(full)
+        return analyze(self, full)
+    monkeypatch.setattr(graph_engine.GraphEngine, "analyze_project", counting)
+
+    auditor = ArchitecturalAuditor(model=_EmptyModel())
+    plan = auditor.WDPPlanner(str(make_project()), "Harden core")
+    auditor.SRCEngine(str(tmp_path / "project"), "Harden core", wdp_plan=plan)
+    assert passes == [True, True]
+
+if __name__ == "__main__":
+    pytest.main([__file__])
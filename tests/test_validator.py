@@ -0,0 +1,57 @@
+import pytest
+from ai_architect.analysis import validator
+from ai_architect.analysis.validator import NoCyclicImports, LayeredArchitectureViolation
+
+def _summary(edges):
+    return {"relationships": [{"from": a, "to": b, "type": "import"} for a, b in edges]}
+
+def test_no_cycles_in_dag():
+    rule = NoCyclicImports("No Cycles", "")
+    assert rule.validate(_summary([("a", "b"), ("a", "c"), ("b", "c")])) == []
+
+def test_reports_each_independent_cycle():
+    rule = NoCyclicImports("No Cycles", "")
+    violations = rule.validate(_summary([("a", "b"), ("b", "c"), ("c", "a"), ("d", "e"), ("e", "d"), ("f", "g")]))
+    assert len(violations) == 2
+    assert all(v.startswith("Cyclic dependency detected") for v in violations)
+
+@pytest.mark.skipif(not validator.HAS_NUMBA, reason="numba not installed")
+def test_jit_kernel_matches_python(monkeypatch):
+    edges = [(f"m{i}", f"m{(i * 7 + 3) % 400}") for i in range(400)] + [(f"m{i}", f"m{i + 1}") for i in range(399)]
+    rule = NoCyclicImports("No Cycles", "")
+    monkeypatch.setattr(validator, "NUMBA_EDGE_THRESHOLD", 0)
+    jit = rule.validate(_summary(edges))
+    monkeypatch.setattr(validator, "NUMBA_EDGE_THRESHOLD", 10**9)
+    assert rule.validate(_summary(edges)) == jit
+
+def _layered_summary(ownership, edges):
+    summary = _summary(edges)
+    summary["modules"] = {name: {"ownership": layer} for name, layer in ownership.items()}
+    return summary
+
+def test_layer_violations_only_for_upward_calls():
+    rule = LayeredArchitectureViolation("Layered Policy", "")
+    summary = _layered_summary(
+        {"api": "Interface", "core": "Core", "db": "Data", "misc": "Unknown", "bare": None},
+        [("api", "core"), ("core", "api"), ("db", "core"), ("misc", "misc"), ("misc", "db"), ("bare", "api"), ("core", "ghost")]
+    )
+    assert rule.validate(summary) == [
+        "Layer Violation: core (Core) calls UP to api (Interface)",
+        "Layer Violation: db (Data) calls UP to core (Core)",
+        "Layer Violation: misc (Unknown) calls UP to db (Data)",
+    ]
+
+@pytest.mark.skipif(not validator.HAS_NUMPY, reason="numpy not installed")
+def test_layer_vectorized_matches_python(monkeypatch):
+    layers = list(LayeredArchitectureViolation.ALLOWED_DOWNWARD) + ["Unknown", None]
+    ownership = {f"m{i}": layers[i % len(layers)] for i in range(60)}
+    edges = [(f"m{i}", f"m{(i * 13 + 5) % 61}") for i in range(60) for _ in range(2)]
+    rule = LayeredArchitectureViolation("Layered Policy", "")
+    monkeypatch.setattr(validator, "NUMPY_EDGE_THRESHOLD", 0)
+    vectorized = rule.validate(_layered_summary(ownership, edges))
+    monkeypatch.setattr(validator, "NUMPY_EDGE_THRESHOLD", 10**9)
+    assert rule.validate(_layered_summary(ownership, edges)) == vectorized
+    assert vectorized
+
+if __name__ == "__main__":
+    pytest.main([__file__])